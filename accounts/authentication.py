@@ -1,18 +1,82 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router, transaction
+
 from accounts.models import Token, User
+from superlists import metrics
+
+
+class UserCache:
+    """A small per-process LRU cache of users by email, with a TTL.
+
+    Saves and deletes invalidate entries in the process that made them;
+    the TTL bounds how long other gunicorn workers can serve a stale user.
+    Hits and misses are counted on /metrics.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        with self._lock:
+            entry = self._users.get(email)
+            if entry is None or entry[1] < time.monotonic():
+                metrics.registry.inc('superlists_cache_requests_total', cache='user', result='miss')
+                return None
+            self._users.move_to_end(email)
+            metrics.registry.inc('superlists_cache_requests_total', cache='user', result='hit')
+            return copy.copy(entry[0])
+
+    def set(self, user):
+        with self._lock:
+            self._users[user.email] = (copy.copy(user), time.monotonic() + self.ttl)
+            self._users.move_to_end(user.email)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+
+    def invalidate(self, email):
+        with self._lock:
+            self._users.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
 
 
 class PasswordlessAuthenticationBackend:
     def authenticate(self, request, token):
-        try:
-            token = Token.objects.get(uid=token)
-            return User.objects.get(email=token.email)
-        except User.DoesNotExist:
-            return User.objects.create(email=token.email)
-        except Token.DoesNotExist:
+        email = Token.objects.valid().filter(uid=token).values_list('email', flat=True).first()
+        if email is None:
             return None
+        # The DELETE is the first statement of the transaction, so SQLite
+        # takes the write lock straight away instead of failing to upgrade
+        # a read.  Only the request whose DELETE removed the token logs in,
+        # so two clicks on the same link can't both use it.
+        with transaction.atomic(using=router.db_for_write(Token)):
+            if not Token.objects.filter(uid=token).delete()[0]:
+                return None
+            user = user_cache.get(email)
+            if user is None:
+                user, _ = User.objects.get_or_create(email=email)
+        return user
 
     def get_user(self, email):
+        user = user_cache.get(email)
+        if user is not None:
+            return user
         try:
-            return User.objects.get(email=email)
+            user = User.objects.get(email=email)
         except User.DoesNotExist:
             return None
+        user_cache.set(user)
+        return user
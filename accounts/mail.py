@@ -0,0 +1,104 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from accounts.models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Email backend that stores messages for the send_queued_mail worker.
+
+    Only plain text messages are supported: headers, alternatives and
+    attachments are not kept.
+    """
+
+    def send_messages(self, email_messages):
+        QueuedEmail.objects.bulk_create(
+            QueuedEmail(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email,
+                to='\n'.join(message.to),
+                cc='\n'.join(message.cc),
+                bcc='\n'.join(message.bcc),
+            )
+            for message in email_messages
+        )
+        return len(email_messages)
+
+
+def _addresses(value):
+    return value.split('\n') if value else []
+
+
+def _retry_delay(attempts):
+    return datetime.timedelta(seconds=settings.MAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def send_queued_mail(batch_size=None):
+    """Send one batch of due messages over a single connection.
+
+    Sent messages are deleted, failed ones are retried with exponential
+    backoff until MAIL_QUEUE_MAX_ATTEMPTS is reached.  Returns the number
+    of messages that went out.
+    """
+    batch = list(
+        QueuedEmail.objects.filter(
+            send_after__lte=timezone.now(),
+            attempts__lt=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+        )[:batch_size or settings.MAIL_QUEUE_BATCH_SIZE]
+    )
+    if not batch:
+        return 0
+    sent = []
+    connection = get_connection(settings.MAIL_QUEUE_EMAIL_BACKEND)
+    try:
+        for queued in batch:
+            message = EmailMessage(
+                queued.subject,
+                queued.body,
+                queued.from_email,
+                _addresses(queued.to),
+                cc=_addresses(queued.cc),
+                bcc=_addresses(queued.bcc),
+            )
+            try:
+                # A no-op while the connection is up, so one SMTP session
+                # carries the whole batch.
+                connection.open()
+                connection.send_messages([message])
+            except Exception as e:
+                # Drop the connection so the next message starts a fresh one.
+                connection.close()
+                queued.attempts += 1
+                queued.send_after = timezone.now() + _retry_delay(queued.attempts)
+                queued.last_error = repr(e)
+                queued.save(update_fields=['attempts', 'send_after', 'last_error'])
+            else:
+                sent.append(queued.id)
+    finally:
+        connection.close()
+    QueuedEmail.objects.filter(id__in=sent).delete()
+    return len(sent)
+
+
+def purge_failed_mail():
+    """Delete the messages that used up MAIL_QUEUE_MAX_ATTEMPTS.
+
+    Each one is logged with its last error first, so the journal keeps a
+    record of mail that never went out.  Returns the number deleted.
+    """
+    failed = list(QueuedEmail.objects.filter(attempts__gte=settings.MAIL_QUEUE_MAX_ATTEMPTS))
+    for queued in failed:
+        logger.warning(
+            'Giving up on email %r to %s after %d attempts: %s',
+            queued.subject, queued.to.replace('\n', ', '), queued.attempts, queued.last_error
+        )
+    QueuedEmail.objects.filter(id__in=[queued.id for queued in failed]).delete()
+    return len(failed)
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import Token
+
+
+class Command(BaseCommand):
+    help = 'Delete expired login tokens in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help='Seconds to sleep between batches, leaving the write lock to requests'
+        )
+
+    def handle(self, *args, **options):
+        deleted = 0
+        while True:
+            ids = list(Token.objects.expired().values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            count, _ = Token.objects.filter(id__in=ids).delete()
+            deleted += count
+            if len(ids) < options['batch_size']:
+                break
+            time.sleep(options['pause'])
+        self.stdout.write(f'Deleted {deleted} expired tokens')
@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.mail import purge_failed_mail, send_queued_mail
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued email in batches; run one instance of this per site'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Send what is due and exit')
+        parser.add_argument('--batch-size', type=int, default=settings.MAIL_QUEUE_BATCH_SIZE)
+        parser.add_argument('--poll-interval', type=float, default=settings.MAIL_QUEUE_POLL_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_queued_mail(options['batch_size'])
+            if sent:
+                self.stdout.write(f'Sent {sent} messages')
+            purged = purge_failed_mail()
+            if purged:
+                self.stdout.write(f'Gave up on {purged} messages')
+            if options['once']:
+                break
+            if sent < options['batch_size']:
+                time.sleep(options['poll_interval'])
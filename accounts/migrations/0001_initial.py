@@ -0,0 +1,29 @@
+# Generated by Django 2.1 on 2026-10-18 09:00
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('email', models.EmailField(max_length=254, primary_key=True, serialize=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Token',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254)),
+                ('uid', models.CharField(default=uuid.uuid4, max_length=40)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.1 on 2026-10-18 09:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField()),
+                ('body', models.TextField()),
+                ('from_email', models.TextField()),
+                ('to', models.TextField()),
+                ('cc', models.TextField(blank=True)),
+                ('bcc', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('send_after', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.1 on 2026-10-18 10:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_queuedemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='token',
+            name='created',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='token',
+            name='uid',
+            field=models.CharField(default=uuid.uuid4, max_length=40, unique=True),
+        ),
+    ]
@@ -1,6 +1,9 @@
+import datetime
 import uuid
 
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class User(models.Model):
@@ -11,6 +14,35 @@ class User(models.Model):
     is_authenticated = True
 
 
+class TokenQuerySet(models.QuerySet):
+    def _cutoff(self):
+        return timezone.now() - datetime.timedelta(seconds=settings.LOGIN_TOKEN_TTL)
+
+    def valid(self):
+        return self.filter(created__gt=self._cutoff())
+
+    def expired(self):
+        return self.filter(created__lte=self._cutoff())
+
+
 class Token(models.Model):
     email = models.EmailField()
-    uid = models.CharField(default=uuid.uuid4, max_length=40)
+    uid = models.CharField(default=uuid.uuid4, max_length=40, unique=True)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TokenQuerySet.as_manager()
+
+
+class QueuedEmail(models.Model):
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.TextField()
+    to = models.TextField()
+    cc = models.TextField(blank=True)
+    bcc = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    send_after = models.DateTimeField(default=timezone.now, db_index=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ('id',)
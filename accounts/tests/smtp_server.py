@@ -0,0 +1,57 @@
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, code, text):
+        self.wfile.write(f'{code} {text}\r\n'.encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply(220, 'localhost SMTP stand-in')
+        lines = None
+        for line in self.rfile:
+            if lines is not None:
+                if line.rstrip(b'\r\n') != b'.':
+                    lines.append(line)
+                    continue
+                if self.server.fail:
+                    self.reply(451, 'try again later')
+                else:
+                    self.server.messages.append(b''.join(lines).decode())
+                    self.reply(250, 'queued')
+                lines = None
+                continue
+            command = line[:4].upper()
+            if command == b'DATA':
+                lines = []
+                self.reply(354, 'end data with <CR><LF>.<CR><LF>')
+            elif command == b'QUIT':
+                self.reply(221, 'bye')
+                return
+            else:
+                self.reply(250, 'ok')
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    """Just enough of an SMTP server to accept Django's smtp backend."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self.fail = False
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -1,12 +1,21 @@
-from django.test import TestCase
+import datetime
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from accounts.authentication import PasswordlessAuthenticationBackend
+from django.utils import timezone
+from accounts.authentication import PasswordlessAuthenticationBackend, UserCache, user_cache
 from accounts.models import Token
 
 User = get_user_model()
 
 
 class AuthenticateTest(TestCase):
+    multi_db = True
+
+    def setUp(self):
+        user_cache.clear()
+
     def test_returns_None_if_no_such_token(self):
         result = PasswordlessAuthenticationBackend().authenticate(None, token='no-such-token')
         self.assertIsNone(result)
@@ -25,8 +34,41 @@ class AuthenticateTest(TestCase):
         user = PasswordlessAuthenticationBackend().authenticate(None, token=token.uid)
         self.assertEqual(user, existing_user)
 
+    def test_consumes_token_and_creates_user_in_one_transaction(self):
+        token = Token.objects.create(email='edith@example.com')
+        # token SELECT, SAVEPOINT, token DELETE, user SELECT, user INSERT
+        # (in its own savepoint), RELEASE SAVEPOINT
+        with self.assertNumQueries(8, using='accounts'):
+            PasswordlessAuthenticationBackend().authenticate(None, token=token.uid)
+        self.assertFalse(Token.objects.exists())
+
+    def test_skips_user_query_for_cached_user(self):
+        user = User.objects.create(email='edith@example.com')
+        user_cache.set(user)
+        token = Token.objects.create(email='edith@example.com')
+        # token SELECT, SAVEPOINT, token DELETE, RELEASE SAVEPOINT
+        with self.assertNumQueries(4, using='accounts'):
+            self.assertEqual(PasswordlessAuthenticationBackend().authenticate(None, token=token.uid), user)
+
+    def test_token_can_only_be_used_once(self):
+        token = Token.objects.create(email='edith@example.com')
+        PasswordlessAuthenticationBackend().authenticate(None, token=token.uid)
+        self.assertIsNone(PasswordlessAuthenticationBackend().authenticate(None, token=token.uid))
+
+    @override_settings(LOGIN_TOKEN_TTL=60)
+    def test_returns_None_if_token_has_expired(self):
+        token = Token.objects.create(
+            email='edith@example.com', created=timezone.now() - datetime.timedelta(seconds=61)
+        )
+        self.assertIsNone(PasswordlessAuthenticationBackend().authenticate(None, token=token.uid))
+
 
 class GetUserTest(TestCase):
+    multi_db = True
+
+    def setUp(self):
+        user_cache.clear()
+
     def test_gets_user_by_email(self):
         User.objects.create(email='another@example.com')
         desired_user = User.objects.create(email='edith@example.com')
@@ -35,3 +77,37 @@ class GetUserTest(TestCase):
 
     def test_returns_None_if_no_user_with_that_email(self):
         self.assertIsNone(PasswordlessAuthenticationBackend().get_user('edith@example.com'))
+
+    def test_second_lookup_is_served_from_cache(self):
+        User.objects.create(email='edith@example.com')
+        backend = PasswordlessAuthenticationBackend()
+        backend.get_user('edith@example.com')
+        with self.assertNumQueries(0, using='accounts'), patch('superlists.metrics.registry') as registry:
+            user = backend.get_user('edith@example.com')
+        self.assertEqual(user.email, 'edith@example.com')
+        registry.inc.assert_called_once_with('superlists_cache_requests_total', cache='user', result='hit')
+
+    def test_deleting_user_invalidates_cache(self):
+        user = User.objects.create(email='edith@example.com')
+        backend = PasswordlessAuthenticationBackend()
+        backend.get_user('edith@example.com')
+        user.delete()
+        self.assertIsNone(backend.get_user('edith@example.com'))
+
+
+class UserCacheTest(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = UserCache(maxsize=2, ttl=60)
+        for email in ('a@b.com', 'b@b.com'):
+            cache.set(User(email=email))
+        cache.get('a@b.com')
+        cache.set(User(email='c@b.com'))
+        self.assertIsNone(cache.get('b@b.com'))
+        self.assertEqual(cache.get('a@b.com').email, 'a@b.com')
+
+    def test_entries_expire(self):
+        cache = UserCache(maxsize=2, ttl=-1)
+        cache.set(User(email='a@b.com'))
+        with patch('superlists.metrics.registry') as registry:
+            self.assertIsNone(cache.get('a@b.com'))
+        registry.inc.assert_called_once_with('superlists_cache_requests_total', cache='user', result='miss')
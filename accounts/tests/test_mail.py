@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.mail import purge_failed_mail, send_queued_mail
+from accounts.models import QueuedEmail
+from accounts.tests.smtp_server import SMTPServer
+
+QUEUED_BACKEND = 'accounts.mail.QueuedEmailBackend'
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+
+def smtp_settings(server):
+    return override_settings(
+        MAIL_QUEUE_EMAIL_BACKEND=SMTP_BACKEND,
+        EMAIL_HOST='127.0.0.1',
+        EMAIL_PORT=server.port,
+        EMAIL_USE_TLS=False,
+        EMAIL_HOST_USER='',
+        EMAIL_HOST_PASSWORD='',
+    )
+
+
+@override_settings(EMAIL_BACKEND=QUEUED_BACKEND)
+class QueuedEmailBackendTest(TestCase):
+    multi_db = True
+
+    def test_send_mail_only_queues_the_message(self):
+        mail.send_mail('subject', 'body', 'from@example.com', ['to@example.com'])
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(queued.subject, 'subject')
+        self.assertEqual(queued.to, 'to@example.com')
+
+    def test_send_login_email_view_queues_the_message(self):
+        response = self.client.post('/accounts/send_login_email', data={'email': 'edith@example.com'})
+        self.assertRedirects(response, '/')
+        self.assertEqual(QueuedEmail.objects.get().to, 'edith@example.com')
+
+
+@override_settings(EMAIL_BACKEND=QUEUED_BACKEND)
+class SendQueuedMailTest(TestCase):
+    multi_db = True
+
+    def queue(self, count):
+        for i in range(count):
+            mail.send_mail(f'subject {i}', 'body', 'from@example.com', [f'to{i}@example.com'])
+
+    def test_sends_batch_over_one_connection(self):
+        self.queue(3)
+        with SMTPServer() as server, smtp_settings(server):
+            self.assertEqual(send_queued_mail(), 3)
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(server.connections, 1)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_respects_batch_size(self):
+        self.queue(3)
+        with SMTPServer() as server, smtp_settings(server):
+            self.assertEqual(send_queued_mail(batch_size=2), 2)
+        self.assertEqual(QueuedEmail.objects.count(), 1)
+
+    def test_failed_messages_are_retried_later(self):
+        self.queue(1)
+        with SMTPServer() as server, smtp_settings(server):
+            server.fail = True
+            self.assertEqual(send_queued_mail(), 0)
+            queued = QueuedEmail.objects.get()
+            self.assertEqual(queued.attempts, 1)
+            self.assertGreater(queued.send_after, timezone.now())
+            self.assertIn('451', queued.last_error)
+
+            self.assertEqual(send_queued_mail(), 0)
+            self.assertEqual(QueuedEmail.objects.get().attempts, 1)
+
+            server.fail = False
+            QueuedEmail.objects.update(send_after=timezone.now())
+            self.assertEqual(send_queued_mail(), 1)
+        self.assertEqual(len(server.messages), 1)
+
+    @override_settings(MAIL_QUEUE_MAX_ATTEMPTS=1)
+    def test_gives_up_after_max_attempts(self):
+        self.queue(1)
+        QueuedEmail.objects.update(attempts=1)
+        with SMTPServer() as server, smtp_settings(server):
+            self.assertEqual(send_queued_mail(), 0)
+        self.assertEqual(server.connections, 0)
+
+    @override_settings(MAIL_QUEUE_MAX_ATTEMPTS=2)
+    def test_purges_messages_that_used_up_their_attempts(self):
+        self.queue(2)
+        QueuedEmail.objects.filter(subject='subject 0').update(attempts=2, last_error='SMTPDataError(451)')
+        with self.assertLogs('accounts.mail', 'WARNING') as logs:
+            self.assertEqual(purge_failed_mail(), 1)
+        self.assertIn('to0@example.com', logs.output[0])
+        self.assertIn('SMTPDataError(451)', logs.output[0])
+        self.assertEqual(QueuedEmail.objects.get().subject, 'subject 1')
+
+    def test_command_sends_once(self):
+        self.queue(2)
+        out = StringIO()
+        with SMTPServer() as server, smtp_settings(server):
+            call_command('send_queued_mail', once=True, stdout=out)
+        self.assertIn('Sent 2 messages', out.getvalue())
+        self.assertIn('Subject: subject 0', server.messages[0])
+
+    @override_settings(MAIL_QUEUE_MAX_ATTEMPTS=1)
+    def test_command_purges_failed_messages(self):
+        self.queue(1)
+        QueuedEmail.objects.update(attempts=1)
+        out = StringIO()
+        with self.assertLogs('accounts.mail', 'WARNING'):
+            call_command('send_queued_mail', once=True, stdout=out)
+        self.assertIn('Gave up on 1 messages', out.getvalue())
+        self.assertFalse(QueuedEmail.objects.exists())
@@ -1,5 +1,10 @@
+import datetime
+from io import StringIO
+
 from django.contrib import auth
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from accounts.models import Token
 
@@ -7,6 +12,8 @@ User = get_user_model()
 
 
 class UserModelTest(TestCase):
+    multi_db = True
+
     def test_user_is_valid_with_email_only(self):
         user = User(email='a@b.com')
         user.full_clean()
@@ -17,7 +24,26 @@ class UserModelTest(TestCase):
 
 
 class TokenModelTest(TestCase):
+    multi_db = True
+
     def test_links_user_with_auto_generated_uid(self):
         token1 = Token.objects.create(email='a@b.com')
         token2 = Token.objects.create(email='a@b.com')
         self.assertNotEqual(token1.uid, token2.uid)
+
+    @override_settings(LOGIN_TOKEN_TTL=60)
+    def test_valid_and_expired_tokens(self):
+        fresh = Token.objects.create(email='a@b.com')
+        stale = Token.objects.create(email='a@b.com', created=timezone.now() - datetime.timedelta(seconds=61))
+        self.assertEqual(list(Token.objects.valid()), [fresh])
+        self.assertEqual(list(Token.objects.expired()), [stale])
+
+    @override_settings(LOGIN_TOKEN_TTL=60)
+    def test_purge_expired_tokens_command(self):
+        fresh = Token.objects.create(email='a@b.com')
+        for _ in range(5):
+            Token.objects.create(email='a@b.com', created=timezone.now() - datetime.timedelta(seconds=61))
+        out = StringIO()
+        call_command('purge_expired_tokens', batch_size=2, pause=0, stdout=out)
+        self.assertEqual(list(Token.objects.all()), [fresh])
+        self.assertIn('Deleted 5 expired tokens', out.getvalue())
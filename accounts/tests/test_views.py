@@ -1,10 +1,16 @@
 from unittest.mock import patch, call
 
+from django.core.cache import cache
 from django.test import TestCase
 from accounts.models import Token
 
 
 class SendLoginEmailViewTest(TestCase):
+    multi_db = True
+
+    def setUp(self):
+        cache.clear()
+
     def test_redirects_to_home_page(self):
         response = self.client.post('/accounts/send_login_email', data={'email': 'edith@example.com'})
         self.assertRedirects(response, '/')
@@ -39,6 +45,14 @@ class SendLoginEmailViewTest(TestCase):
         (subject, body, from_email, to_list), kwargs = mock_send_mail.call_args
         self.assertIn(expected_url, body)
 
+    def test_rejects_bursts_for_one_email(self):
+        for _ in range(5):
+            self.client.post('/accounts/send_login_email', data={'email': 'edith@example.com'})
+        response = self.client.post('/accounts/send_login_email', data={'email': 'edith@example.com'})
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(response.has_header('Retry-After'))
+        self.assertEqual(Token.objects.count(), 5)
+
 
 @patch('accounts.views.auth')
 class LoginViewTest(TestCase):
@@ -4,8 +4,10 @@ from django.shortcuts import redirect
 from django.urls import reverse
 
 from accounts.models import Token
+from superlists.ratelimit import client_ip, posted_email, rate_limit
 
 
+@rate_limit('send_login_email', keys=(client_ip, posted_email))
 def send_login_email(request):
     email = request.POST['email']
     token = Token.objects.create(email=email)
@@ -0,0 +1,80 @@
+"""Compare request latency of the home page and login flow per session engine.
+
+Runs the views in-process through Django's test client against throwaway
+test databases, once for every engine in settings.SESSION_ENGINES.
+
+    python benchmarks/sessions.py --requests 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'superlists.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+from accounts.models import Token  # noqa: E402
+
+
+def timed(fn, requests):
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def scenarios(client):
+    def anonymous_home(i):
+        client.logout()
+        client.get('/')
+
+    def log_in(i):
+        email = f'user{i}@example.com'
+        client.post('/accounts/send_login_email', data={'email': email})
+        token = Token.objects.filter(email=email).latest('id')
+        client.get(f'/accounts/login?token={token.uid}')
+
+    def logged_in_home(i):
+        client.get('/')
+
+    return [('anonymous home', anonymous_home), ('send email + login', log_in), ('logged-in home', logged_in_home)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    # Same file cache as the site, but not the site's directory.
+    cache_directory = tempfile.TemporaryDirectory()
+    caches = {**settings.CACHES, 'default': {**settings.CACHES['default'], 'LOCATION': cache_directory.name}}
+    try:
+        print(f'{"engine":<16}{"scenario":<22}{"mean ms":>10}{"p95 ms":>10}')
+        for name, engine in settings.SESSION_ENGINES.items():
+            with override_settings(SESSION_ENGINE=engine, RATE_LIMITS={}, CACHES=caches):
+                client = Client()
+                for scenario, fn in scenarios(client):
+                    mean, p95 = timed(fn, args.requests)
+                    print(f'{name:<16}{scenario:<22}{mean:>10.2f}{p95:>10.2f}')
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        cache_directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
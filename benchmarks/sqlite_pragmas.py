@@ -0,0 +1,121 @@
+"""Compare SQLite throughput with Django's defaults against superlists' tuning.
+
+Each worker process plays a gunicorn sync worker serving a mix of list
+reads (item page SELECTs) and item INSERTs against one shared database
+file.  The "default" profile opens a connection per request with rollback
+journaling and synchronous=FULL, as CONN_MAX_AGE=0 does; the "tuned"
+profile keeps one connection per worker and applies SQLITE_PRAGMAS.
+
+    python benchmarks/sqlite_pragmas.py --workers 4 --seconds 5
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'superlists.settings')
+
+from django.conf import settings  # noqa: E402
+
+PROFILES = {
+    'default': {'persistent': False, 'pragmas': {'journal_mode': 'delete', 'synchronous': 'full'}},
+    # The settings, SQLITE_* environment overrides included, so this
+    # measures whatever the site runs with.
+    'tuned': {'persistent': True, 'pragmas': settings.SQLITE_PRAGMAS},
+}
+LISTS = 100
+
+
+def connect(path, pragmas):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def create_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE lists_list (id integer NOT NULL PRIMARY KEY AUTOINCREMENT);
+        CREATE TABLE lists_item (
+            id integer NOT NULL PRIMARY KEY AUTOINCREMENT,
+            text text NOT NULL,
+            list_id integer NOT NULL REFERENCES lists_list (id)
+        );
+        CREATE INDEX lists_item_list_id ON lists_item (list_id);
+    ''')
+    conn.executemany('INSERT INTO lists_list (id) VALUES (?)', [(i,) for i in range(1, LISTS + 1)])
+    conn.executemany(
+        'INSERT INTO lists_item (text, list_id) VALUES (?, ?)',
+        [(f'item {i}', i % LISTS + 1) for i in range(20000)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def worker(path, profile, write_ratio, deadline, results):
+    rng = random.Random(os.getpid())
+    reads = writes = 0
+    conn = connect(path, profile['pragmas']) if profile['persistent'] else None
+    while time.time() < deadline:
+        request_conn = conn or connect(path, profile['pragmas'])
+        list_id = rng.randint(1, LISTS)
+        if rng.random() < write_ratio:
+            request_conn.execute('BEGIN IMMEDIATE')
+            request_conn.execute(
+                'INSERT INTO lists_item (text, list_id) VALUES (?, ?)', (f'new {rng.random()}', list_id)
+            )
+            request_conn.execute('COMMIT')
+            writes += 1
+        else:
+            request_conn.execute(
+                'SELECT id, text FROM lists_item WHERE list_id = ? ORDER BY id LIMIT 51', (list_id,)
+            ).fetchall()
+            reads += 1
+        if not conn:
+            request_conn.close()
+    results.put((reads, writes))
+
+
+def run(profile_name, workers, seconds, write_ratio):
+    profile = PROFILES[profile_name]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.sqlite3')
+        create_database(path)
+        connect(path, profile['pragmas']).close()
+        results = multiprocessing.Queue()
+        deadline = time.time() + seconds
+        processes = [
+            multiprocessing.Process(target=worker, args=(path, profile, write_ratio, deadline, results))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    reads = sum(r for r, _ in totals)
+    writes = sum(w for _, w in totals)
+    return reads / seconds, writes / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+    print(f'{args.workers} workers, {args.seconds:g}s, {args.write_ratio:.0%} writes')
+    print(f'{"profile":<10}{"reads/s":>12}{"writes/s":>12}')
+    for name in PROFILES:
+        reads, writes = run(name, args.workers, args.seconds, args.write_ratio)
+        print(f'{name:<10}{reads:>12.0f}{writes:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Time rendering of home.html and list.html with and without template caching.
+
+"uncached" reloads and reparses templates on every render and skips the
+navbar fragment cache; "cached" uses the settings' cached loader and the
+"fragments" cache.  Pages are rendered for a logged-in user.
+
+    python benchmarks/templates.py --renders 500 --items 50
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'superlists.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.template.loader import render_to_string  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+
+from accounts.models import User  # noqa: E402
+from lists.forms import BulkItemForm, ExistingListItemForm, ItemForm  # noqa: E402
+from lists.models import Item, List  # noqa: E402
+from lists.pagination import ItemPage  # noqa: E402
+
+
+def _uncached_loaders():
+    loaders = settings.TEMPLATES[0]['OPTIONS']['loaders']
+    # Outside DEBUG the settings wrap them in the cached loader.
+    if isinstance(loaders[0], tuple) and loaders[0][0] == 'django.template.loaders.cached.Loader':
+        return loaders[0][1]
+    return loaders
+
+
+def profiles():
+    loaders = _uncached_loaders()
+    uncached = copy.deepcopy(settings.TEMPLATES)
+    uncached[0]['OPTIONS']['loaders'] = loaders
+    caches = copy.deepcopy(settings.CACHES)
+    caches['fragments'] = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    cached = copy.deepcopy(settings.TEMPLATES)
+    cached[0]['OPTIONS']['loaders'] = [('django.template.loaders.cached.Loader', loaders)]
+    return [
+        ('uncached', override_settings(TEMPLATES=uncached, CACHES=caches)),
+        ('cached', override_settings(TEMPLATES=cached)),
+    ]
+
+
+def pages(items):
+    request = RequestFactory().get('/')
+    request.user = User(email='edith@example.com')
+    list_ = List(id=1)
+    page = ItemPage([Item(id=i, list=list_, text=f'item {i}') for i in range(items)], 0, False, False)
+
+    def home():
+        return render_to_string('home.html', {'form': ItemForm()}, request=request)
+
+    def list_page():
+        table = render_to_string('list_table.html', {'list': list_, 'page': page})
+        return render_to_string('list.html', {
+            'list': list_,
+            'form': ExistingListItemForm(for_list=list_),
+            'bulk_form': BulkItemForm(for_list=list_),
+            'table': table,
+        }, request=request)
+
+    return [('home.html', home), ('list.html', list_page)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--renders', type=int, default=500)
+    parser.add_argument('--items', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f'{"profile":<10}{"template":<12}{"mean ms":>10}{"p95 ms":>10}')
+    for profile, overrides in profiles():
+        with overrides:
+            for name, render in pages(args.items):
+                render()
+                timings = []
+                for _ in range(args.renders):
+                    start = time.perf_counter()
+                    render()
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                print(f'{profile:<10}{name:<12}{statistics.mean(timings):>10.3f}{p95:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
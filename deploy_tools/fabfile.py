@@ -1,24 +1,62 @@
+import os
 import random
+import time
+from contextlib import contextmanager
 
-from fabric.contrib.files import append, exists, sed
-from fabric.api import env, local, run
+from fabric.contrib.files import append, exists, sed, upload_template
+from fabric.api import env, local, parallel, run, sudo
+from fabric.utils import puts
 
 REPO_URL = 'https://github.com/ABo213/superlists'
 
 
-def deploy():
+# Runs on every host given with -H at once: fab -H staging,live deploy
+@parallel
+def deploy(worker_class='sync', threads=1, workers=None, max_requests=1000, keepalive=5, timeout=30):
     site_folder = f'/home/{env.user}/sites/{env.host}'
     source_folder = site_folder + '/source'
-    _create_directory_structure_if_necessary(site_folder)
-    _get_latest_source(source_folder)
-    _update_settings(source_folder, env.host)
-    _update_virtualenv(source_folder)
-    _update_static_files(source_folder)
-    _update_database(source_folder)
+    start = time.monotonic()
+    with _step('directories'):
+        _create_directory_structure_if_necessary(site_folder)
+    with _step('source'):
+        _get_latest_source(source_folder)
+        _update_settings(source_folder, env.host)
+    with _step('virtualenv'):
+        _update_virtualenv(source_folder)
+    with _step('static files'):
+        _update_static_files(source_folder)
+    with _step('database'):
+        _update_database(source_folder)
+    with _step('gunicorn config'):
+        _update_gunicorn_config(site_folder, worker_class, int(threads), workers, int(max_requests), keepalive, timeout)
+    with _step('reload'):
+        _reload_services()
+    puts(f'deployed in {time.monotonic() - start:.1f}s')
+
+
+@contextmanager
+def _step(name):
+    start = time.monotonic()
+    yield
+    puts(f'{name}: {time.monotonic() - start:.1f}s')
+
+
+def _digest(source_folder, *paths):
+    # Hashes git's blob ids rather than reading the files themselves.
+    pathspecs = ' '.join(f"'{path}'" for path in paths)
+    return run(f'cd {source_folder} && git ls-files -s -- {pathspecs} | sha256sum | cut -d" " -f1', quiet=True)
+
+
+def _unchanged(stamp_file, digest):
+    return exists(stamp_file) and run(f'cat {stamp_file}', quiet=True).strip() == digest
+
+
+def _stamp(stamp_file, digest):
+    run(f'echo {digest} > {stamp_file}', quiet=True)
 
 
 def _create_directory_structure_if_necessary(site_folder):
-    for folder in ('database', 'static', 'venv', 'source'):
+    for folder in ('database', 'cache', 'static', 'venv', 'source'):
         run(f'mkdir -p {site_folder}/{folder}')
 
 
@@ -29,6 +67,10 @@ def _get_latest_source(source_folder):
         run(f'git clone {REPO_URL} {source_folder}')
     current_commit = local("git log -n 1 --format=%H", capture=True)
     run(f'cd {source_folder} && git reset --hard {current_commit}')
+    # Deploys used to run makemigrations on the server.  reset --hard keeps
+    # the untracked files it generated, which would clash with the
+    # committed migrations.
+    run(f"cd {source_folder} && git clean -f -- '*/migrations/*.py'")
 
 
 def _update_settings(source_folder, site_name):
@@ -47,13 +89,76 @@ def _update_virtualenv(source_folder):
     virtualenv_folder = source_folder + '/../venv'
     if not exists(virtualenv_folder + '/bin/pip'):
         run(f'python3.7 -m venv {virtualenv_folder}')
+    stamp_file = virtualenv_folder + '/requirements.sha256'
+    digest = _digest(source_folder, 'requirements.txt')
+    if _unchanged(stamp_file, digest):
+        puts('requirements unchanged, skipping pip install')
+        return
     run(f'{virtualenv_folder}/bin/pip install -r {source_folder}/requirements.txt')
+    _stamp(stamp_file, digest)
 
 
 def _update_static_files(source_folder):
+    # Outside STATIC_ROOT, which nginx serves.
+    stamp_file = source_folder + '/../static.sha256'
+    # Transitional: removes the stamp earlier deploys wrote inside
+    # STATIC_ROOT.  Delete this line once staging and live have both been
+    # deployed with it.
+    run(f'rm -f {source_folder}/../static/source.sha256')
+    digest = _digest(source_folder, '*/static/*', 'superlists/storage.py')
+    if _unchanged(stamp_file, digest):
+        puts('static files unchanged, skipping collectstatic')
+        return
     run(f'cd {source_folder} && ../venv/bin/python manage.py collectstatic --noinput')
+    _stamp(stamp_file, digest)
 
 
 def _update_database(source_folder):
-    run(f'cd {source_folder} && ../venv/bin/python manage.py makemigrations --noinput')
-    run(f'cd {source_folder} && ../venv/bin/python manage.py migrate --noinput')
+    # Migrations are committed, so there is nothing pending unless the
+    # migration files changed since the last successful migrate.
+    stamp_file = source_folder + '/../database/migrations.sha256'
+    digest = _digest(source_folder, '*/migrations/*.py')
+    if _unchanged(stamp_file, digest):
+        puts('no new migrations, skipping migrate')
+        return
+    for database in ('default', 'accounts', 'sessions'):
+        # --fake-initial: databases set up by the old server-side
+        # makemigrations already have the initial tables.
+        run(
+            f'cd {source_folder} && ../venv/bin/python manage.py migrate --noinput --fake-initial '
+            f'--database {database}'
+        )
+    _stamp(stamp_file, digest)
+
+
+def _update_gunicorn_config(site_folder, worker_class, threads, workers, max_requests, keepalive, timeout):
+    cpus = int(run('nproc'))
+    if workers is None:
+        # Threaded workers overlap their own I/O waits, so fewer processes do.
+        workers = cpus + 1 if worker_class == 'gthread' else 2 * cpus + 1
+    upload_template(
+        'gunicorn.conf.template',
+        f'{site_folder}/gunicorn.conf.py',
+        context={
+            'host': env.host,
+            'site_folder': site_folder,
+            'cpus': cpus,
+            'workers': workers,
+            'worker_class': worker_class,
+            'threads': threads,
+            'max_requests': max_requests,
+            'max_requests_jitter': max_requests // 10,
+            'keepalive': keepalive,
+            'timeout': timeout,
+        },
+        template_dir=os.path.dirname(os.path.abspath(__file__)),
+    )
+
+
+def _reload_services():
+    # The service's ExecReload swaps in a new, warmed-up master next to the
+    # running one (see gunicorn-reload.sh); the first deploy starts it instead.
+    sudo(f'systemctl reload-or-restart gunicorn-{env.host}')
+    # The mail worker is a plain loop with the old code and models loaded;
+    # a restart only delays queued mail by a moment.
+    sudo(f'systemctl restart mailqueue-{env.host}')
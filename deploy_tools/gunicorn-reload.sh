@@ -0,0 +1,64 @@
+#!/bin/bash
+# Swaps a running gunicorn over to the code on disk without dropping requests.
+# Run by systemctl reload (ExecReload) as: gunicorn-reload.sh SITE_FOLDER SITENAME
+#
+# USR2 starts a second master on the new code that shares the listening socket
+# with the old one. Once all its workers are up, WINCH stops the old workers and
+# the new ones must answer a request before the old master is retired. If any
+# step fails, the old master keeps serving.
+set -euo pipefail
+
+site_folder=$1
+host=$2
+pidfile=$site_folder/gunicorn.pid
+workers=$(sed -n 's/^workers = //p' "$site_folder/gunicorn.conf.py")
+
+wait_for() {
+    local deadline=$((SECONDS + $1))
+    shift
+    until "$@"; do
+        ((SECONDS < deadline)) || return 1
+        sleep 0.2
+    done
+}
+
+new_master_started() {
+    [[ -f $pidfile.oldbin && -f $pidfile && $(cat "$pidfile") != "$old" ]]
+}
+
+workers_started() {
+    (($(pgrep -c -P "$new") >= workers))
+}
+
+healthy() {
+    [[ $(curl -s -o /dev/null -w '%{http_code}' --unix-socket "/tmp/$host.socket" -H "Host: $host" http://localhost/) == 200 ]]
+}
+
+new_master_stopped() {
+    ! kill -0 "$new" 2>/dev/null
+}
+
+rollback() {
+    echo "new gunicorn master $new is not ready, keeping $old" >&2
+    # HUP brings back the old workers if WINCH already stopped them.
+    [[ ${winched:-} ]] && kill -HUP "$old"
+    kill -TERM "$new"
+    wait_for 30 new_master_stopped || true
+    echo "$old" > "$pidfile"
+    rm -f "$pidfile.oldbin"
+    exit 1
+}
+
+old=$(cat "$pidfile")
+kill -USR2 "$old"
+if ! wait_for 60 new_master_started; then
+    echo "gunicorn master $old did not start a new master" >&2
+    exit 1
+fi
+new=$(cat "$pidfile")
+
+wait_for 60 workers_started || rollback
+kill -WINCH "$old"
+winched=1
+wait_for 10 healthy || rollback
+kill -TERM "$old"
@@ -1,33 +1,79 @@
 import os
+import sys
 import time
 
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
 from selenium import webdriver
 from selenium.common.exceptions import WebDriverException
 
+MAX_WAIT = 10
+MAX_POLL_INTERVAL = 0.5
+
 
 def wait(fn):
+    # Most conditions hold within a few milliseconds, so poll often at first
+    # and back off for the slow ones.
     def modified_fn(*args, **kwargs):
-        start_time = time.time()
+        start_time = time.monotonic()
+        interval = 0.01
         while True:
             try:
                 return fn(*args, **kwargs)
             except (AssertionError, WebDriverException) as e:
-                if time.time() - start_time > 10:
+                if time.monotonic() - start_time > MAX_WAIT:
                     raise e
-                time.sleep(0.5)
+                time.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
     return modified_fn
 
 
+def _start_browser():
+    options = webdriver.ChromeOptions()
+    if os.environ.get('HEADLESS'):
+        options.add_argument('--headless')
+    return webdriver.Chrome(options=options)
+
+
 class FunctionalTest(StaticLiveServerTestCase):
+    """Each test class shares one browser, whose cookies are cleared
+    between tests.
+
+    Test classes can run in parallel, each process against its own live
+    server: HEADLESS=1 python manage.py test functional_tests --parallel
+    """
+    multi_db = True
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        try:
+            cls.browser = _start_browser()
+        except Exception:
+            # tearDownClass isn't called when setUpClass fails, so stop the
+            # live server here rather than leave its thread and port behind.
+            super().tearDownClass()
+            raise
+        cls.timings = []
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.browser.quit()
+        for test, seconds in sorted(cls.timings, key=lambda timing: timing[1], reverse=True):
+            sys.stderr.write(f'{seconds:6.2f}s {test}\n')
+        super().tearDownClass()
+
     def setUp(self):
-        self.browser = webdriver.Chrome()
         staging_server = os.environ.get('STAGING_SERVER')
         if staging_server:
             self.live_server_url = 'http://' + staging_server
+        self.reset_browser()
+        start = time.monotonic()
+        self.addCleanup(lambda: self.timings.append((self.id(), time.monotonic() - start)))
 
-    def tearDown(self):
-        self.browser.quit()
+    def reset_browser(self):
+        """Forget the session, as if a new user opened the site."""
+        self.browser.get(self.live_server_url + '/404_no_such_url/')
+        self.browser.delete_all_cookies()
 
     @wait
     def wait_for_row_in_list_table(self, row_text):
@@ -1,4 +1,3 @@
-from selenium import webdriver
 from selenium.webdriver.common import keys
 
 from functional_tests.base import FunctionalTest
@@ -35,8 +34,7 @@ class NewVisitorTest(FunctionalTest):
         ones_list_url = self.browser.current_url
         self.assertRegex(ones_list_url, '/lists/.+')
 
-        self.browser.quit()
-        self.browser = webdriver.Chrome()
+        self.reset_browser()
 
         self.browser.get(self.live_server_url)
         page_text = self.browser.find_element_by_tag_name('body').text
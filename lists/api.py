@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from lists.forms import ExistingListItemForm
+from lists.models import List
+from lists.pagination import ITEMS_PER_PAGE, MAX_ITEM_ID, get_item_page, parse_cursor
+from superlists.ratelimit import client_ip, rate_limit
+
+MAX_PAGE_SIZE = 200
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'separators': (',', ':')})
+
+
+def encode_cursor(item_id):
+    return base64.urlsafe_b64encode(str(item_id).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(cursor)
+    item_id = parse_cursor(value)
+    if item_id is None:
+        raise ValueError(cursor)
+    return item_id
+
+
+def _item(item):
+    return {'id': item.id, 'text': item.text}
+
+
+def _items_page(list_id, after, size):
+    page = get_item_page(list_id, after=after, size=size)
+    return {
+        'items': [_item(item) for item in page.items],
+        'next': encode_cursor(page.next_cursor) if page.has_next else None,
+    }
+
+
+@require_GET
+def list_detail(request, list_id):
+    list_ = get_object_or_404(List, id=list_id)
+    return _json({
+        'id': list_.id,
+        'modified': list_.modified,
+        **_items_page(list_.id, None, ITEMS_PER_PAGE),
+    })
+
+
+# No CSRF token, so only JSON bodies are accepted: a cross-site form can't
+# send application/json without a CORS preflight, which we never allow.
+@csrf_exempt
+@rate_limit('api_add_item', keys=(client_ip,))
+@require_http_methods(['GET', 'POST'])
+def list_items(request, list_id):
+    list_ = get_object_or_404(List, id=list_id)
+    if request.method == 'POST':
+        if request.content_type != 'application/json':
+            return HttpResponse('Send items as application/json', status=415)
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return HttpResponseBadRequest('Invalid JSON')
+        if not isinstance(data, dict):
+            return HttpResponseBadRequest('Expected a JSON object')
+        form = ExistingListItemForm(for_list=list_, data=data)
+        if not form.is_valid():
+            return _json({'errors': form.errors.get_json_data()}, status=400)
+        return _json(_item(form.save()), status=201)
+
+    try:
+        after = decode_cursor(request.GET['cursor']) if 'cursor' in request.GET else None
+        limit = int(request.GET.get('limit', ITEMS_PER_PAGE))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid cursor or limit')
+    if not 1 <= limit <= MAX_ITEM_ID:
+        return HttpResponseBadRequest('Invalid cursor or limit')
+    return _json(_items_page(list_.id, after, min(limit, MAX_PAGE_SIZE)))
@@ -0,0 +1,8 @@
+from django.conf.urls import url
+
+from . import api
+
+urlpatterns = [
+    url(r'^(\d+)/$', api.list_detail, name='api_list'),
+    url(r'^(\d+)/items/$', api.list_items, name='api_list_items'),
+]
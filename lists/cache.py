@@ -0,0 +1,74 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from lists.models import Item, List
+from lists.pagination import get_item_page
+from superlists import metrics
+
+
+def _state_key(list_id):
+    return f'lists:state:{list_id}'
+
+
+def _table_key(list_id, version, after, before):
+    return f'lists:table:{list_id}:{version}:{after}:{before}'
+
+
+def _set_list_state(list_id, modified):
+    cache.set(_state_key(list_id), {'version': uuid.uuid4().hex, 'modified': modified}, None)
+
+
+def get_list_state(list_id):
+    """Return the list's cache version token and last modification time.
+
+    The token doubles as the list page's ETag.  It is only read from the
+    database when the cache has lost it.
+    """
+    key = _state_key(list_id)
+    state = cache.get(key)
+    if state is None:
+        version, modified = List.objects.values_list('version', 'modified').get(id=list_id)
+        state = {'version': f'v{version}', 'modified': modified}
+        cache.add(key, state, None)
+        state = cache.get(key, state)
+    return state
+
+
+def reset_list(list_):
+    _set_list_state(list_.id, list_.modified)
+
+
+def touch_list(list_id):
+    modified = timezone.now()
+    List.objects.filter(id=list_id).update(version=F('version') + 1, modified=modified)
+    _set_list_state(list_id, modified)
+    # Readers that picked up the new token before the write committed may
+    # have cached the old items under it, so move on once more after commit.
+    transaction.on_commit(lambda: _set_list_state(list_id, modified))
+
+
+def get_list_table(list_id, after=None, before=None):
+    # The version is read before the items, so a table rendered from a
+    # snapshot that a concurrent write has since outdated is stored under
+    # the old version and never served again.
+    key = _table_key(list_id, get_list_state(list_id)['version'], after, before)
+    table = cache.get(key)
+    if table is not None:
+        metrics.registry.inc('superlists_cache_requests_total', cache='list_table', result='hit')
+        return mark_safe(table)
+    metrics.registry.inc('superlists_cache_requests_total', cache='list_table', result='miss')
+    list_ = List.objects.get(id=list_id)
+    page = get_item_page(list_.id, after=after, before=before)
+    table = render_to_string('list_table.html', {'list': list_, 'page': page})
+    # Cursors come from the query string; only the ones our own pagination
+    # links use, item ids of this list, may take up cache entries.
+    cursor = after if after is not None else before
+    if cursor is None or Item.objects.filter(list_id=list_id, id=cursor).exists():
+        cache.set(key, str(table))
+    return mark_safe(table)
@@ -1,10 +1,14 @@
 from django import forms
 from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
+from django.db import IntegrityError, transaction
 
-from lists.models import Item
+from lists.cache import touch_list
+from lists.models import Item, List, text_digest
 
 EMPTY_ITEM_ERROR_MESSAGE = 'You can\'t have an empty list item'
 DUPLICATE_ITEM_ERROR_MESSAGE = "You've already got this in your list"
+MAX_BULK_ITEMS = 500
+TOO_MANY_ITEMS_ERROR_MESSAGE = f"You can add at most {MAX_BULK_ITEMS} items at once"
 
 
 class ItemForm(forms.models.ModelForm):
@@ -25,6 +29,15 @@ class ItemForm(forms.models.ModelForm):
         self.instance.list = for_list
         return super(ItemForm, self).save()
 
+    def save_as_new_list(self):
+        with transaction.atomic():
+            list_ = List.objects.create()
+            self.instance.list = list_
+            # Nobody can have read a list that isn't committed yet, so the
+            # item skips Item.save and the version bump its signal does.
+            Item.objects.bulk_create([self.instance])
+        return list_
+
 
 class ExistingListItemForm(ItemForm):
     def __init__(self, for_list, *args, **kwargs):
@@ -41,3 +54,53 @@ class ExistingListItemForm(ItemForm):
     def save(self):
         return forms.models.ModelForm.save(self)
 
+
+class BulkItemForm(forms.Form):
+    texts = forms.CharField(
+        widget=forms.Textarea(attrs={
+            'placeholder': 'Paste one to-do item per line',
+            'class': 'form-control',
+            'rows': 3}
+        ),
+        error_messages={'required': EMPTY_ITEM_ERROR_MESSAGE}
+    )
+
+    def __init__(self, for_list, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.for_list = for_list
+
+    def clean_texts(self):
+        texts = [line.strip() for line in self.cleaned_data['texts'].splitlines()]
+        texts = list(dict.fromkeys(text for text in texts if text))
+        if not texts:
+            raise ValidationError(EMPTY_ITEM_ERROR_MESSAGE)
+        if len(texts) > MAX_BULK_ITEMS:
+            raise ValidationError(TOO_MANY_ITEMS_ERROR_MESSAGE)
+        return texts
+
+    def save(self):
+        digests = {text_digest(text): text for text in self.cleaned_data['texts']}
+        try:
+            return self._save_new(digests)
+        except IntegrityError:
+            # A concurrent post added some of the same items between the
+            # check and the insert; checking again leaves those out.
+            return self._save_new(digests)
+
+    def _existing_hashes(self, digests):
+        return set(
+            Item.objects.filter(list=self.for_list, text_hash__in=digests)
+            .order_by().values_list('text_hash', flat=True)
+        )
+
+    def _save_new(self, digests):
+        with transaction.atomic():
+            existing = self._existing_hashes(digests)
+            items = Item.objects.bulk_create(
+                Item(list=self.for_list, text=text, text_hash=digest)
+                for digest, text in digests.items() if digest not in existing
+            )
+            # bulk_create doesn't send post_save, so the list is touched here.
+            if items:
+                touch_list(self.for_list.id)
+        return items
@@ -0,0 +1,209 @@
+import collections
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from accounts.models import Token
+from lists.models import Item, List, text_digest
+
+ENDPOINTS = ('home', 'new_list', 'view_list', 'send_login_email', 'login')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(timings, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return timings[max(0, int(round(fraction * len(timings))) - 1)]
+
+
+def summarize(timings, statuses, queries, elapsed):
+    timings = sorted(timings)
+    return {
+        'requests': len(timings),
+        'errors': sum(1 for status in statuses if status >= 400),
+        'requests_per_second': len(timings) / elapsed,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'queries_per_request': statistics.mean(queries) if queries else 0,
+    }
+
+
+def _send(port, endpoint, method, path, body):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    headers = {'X-Bench-Endpoint': endpoint}
+    if body is not None:
+        body = urllib.parse.urlencode(body)
+        headers['Content-Type'] = 'application/x-www-form-urlencoded'
+    start = time.perf_counter()
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    response.read()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed, response.status
+
+
+def _send_all(args):
+    port, endpoint, requests = args
+    return [_send(port, endpoint, *request) for request in requests]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed throwaway databases and measure throughput, latency and query '
+        'counts of the core views through a local WSGI server'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--mode', choices=('threads', 'processes'), default='threads')
+        parser.add_argument('--lists', type=int, default=100, help='Lists to seed')
+        parser.add_argument('--items', type=int, default=20, help='Items per seeded list')
+        parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=list(ENDPOINTS))
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for alias in connections:
+                # Files rather than shared memory, so every server thread sees
+                # the same data; no persistent connections on a thread-per-
+                # request server.
+                connections[alias].settings_dict['TEST']['NAME'] = os.path.join(directory, f'{alias}.sqlite3')
+                connections[alias].settings_dict['CONN_MAX_AGE'] = 0
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                with override_settings(**self.bench_settings(directory)):
+                    results = self.run_bench(options)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(
+            f'{"endpoint":<18}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}{"errors":>8}'
+        )
+        for endpoint, result in results.items():
+            self.stdout.write(
+                f'{endpoint:<18}{result["requests_per_second"]:>9.1f}{result["p50_ms"]:>9.2f}'
+                f'{result["p95_ms"]:>9.2f}{result["p99_ms"]:>9.2f}'
+                f'{result["queries_per_request"]:>9.1f}{result["errors"]:>8}'
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({
+                    'concurrency': options['concurrency'],
+                    'mode': options['mode'],
+                    'requests': options['requests'],
+                    'seed': {'lists': options['lists'], 'items': options['items']},
+                    'results': results,
+                }, output, indent=2)
+
+    def bench_settings(self, directory):
+        return {
+            'ALLOWED_HOSTS': ['127.0.0.1'],
+            'METRICS_DB': os.path.join(directory, 'metrics.sqlite3'),
+            # Keep the bench's lists out of the site's shared cache.
+            'CACHES': {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'},
+                'fragments': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench-fragments'},
+            },
+            'RATE_LIMITS': {},
+            # The clients don't hold sessions, so they can't pass CSRF checks.
+            'MIDDLEWARE': [m for m in settings.MIDDLEWARE if m != 'django.middleware.csrf.CsrfViewMiddleware'],
+        }
+
+    def seed(self, options):
+        List.objects.bulk_create(List() for _ in range(options['lists']))
+        list_ids = list(List.objects.values_list('id', flat=True))
+        Item.objects.bulk_create(
+            Item(list_id=list_id, text=f'item {i}', text_hash=text_digest(f'item {i}'))
+            for list_id in list_ids for i in range(options['items'])
+        )
+        tokens = Token.objects.bulk_create(
+            Token(email=f'bench{i}@example.com') for i in range(options['requests'])
+        )
+        return list_ids, [token.uid for token in tokens]
+
+    def requests_for(self, endpoint, count, list_ids, token_uids):
+        if endpoint == 'home':
+            return [('GET', '/', None)] * count
+        if endpoint == 'new_list':
+            return [('POST', '/lists/new', {'text': f'new item {i}'}) for i in range(count)]
+        if endpoint == 'view_list':
+            return [('GET', f'/lists/{random.choice(list_ids)}/', None) for _ in range(count)]
+        if endpoint == 'send_login_email':
+            return [('POST', '/accounts/send_login_email', {'email': f'user{i}@example.com'}) for i in range(count)]
+        return [('GET', f'/accounts/login?token={uid}', None) for uid in token_uids[:count]]
+
+    def run_bench(self, options):
+        list_ids, token_uids = self.seed(options)
+        queries = collections.defaultdict(list)
+        lock = threading.Lock()
+        app = get_wsgi_application()
+
+        def counting_app(environ, start_response):
+            count = 0
+
+            def counter(execute, sql, params, many, context):
+                nonlocal count
+                count += 1
+                return execute(sql, params, many, context)
+
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(counter))
+                response = app(environ, start_response)
+            with lock:
+                queries[environ.get('HTTP_X_BENCH_ENDPOINT')].append(count)
+            return response
+
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+        server.daemon_threads = True
+        server.set_app(counting_app)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+        concurrency = options['concurrency']
+        results = {}
+        try:
+            for endpoint in options['endpoints']:
+                requests = self.requests_for(endpoint, options['requests'], list_ids, token_uids)
+                chunks = [(port, endpoint, requests[i::concurrency]) for i in range(concurrency)]
+                executor = (
+                    multiprocessing.Pool(concurrency) if options['mode'] == 'processes'
+                    else ThreadPoolExecutor(concurrency)
+                )
+                start = time.perf_counter()
+                with executor:
+                    responses = [response for chunk in executor.map(_send_all, chunks) for response in chunk]
+                elapsed = time.perf_counter() - start
+                results[endpoint] = summarize(
+                    [timing for timing, _ in responses],
+                    [status for _, status in responses],
+                    queries[endpoint],
+                    elapsed,
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+        return results
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lists.models import List
+
+
+class Command(BaseCommand):
+    help = 'Delete lists that have no items, a chunk at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        deleted = 0
+        last_id = 0
+        while True:
+            ids = list(
+                List.objects.filter(id__gt=last_id, item__isnull=True)
+                .order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            # Re-checked inside the delete so a list that got its first item
+            # since the scan is kept.
+            with transaction.atomic():
+                count, _ = List.objects.filter(id__in=ids, item__isnull=True).delete()
+            deleted += count
+            last_id = ids[-1]
+        self.stdout.write(f'Deleted {deleted} empty lists')
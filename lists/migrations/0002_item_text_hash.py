@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='item',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='text_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,34 @@
+import hashlib
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def backfill_text_hash(apps, schema_editor):
+    Item = apps.get_model('lists', 'Item')
+    last_id = 0
+    while True:
+        # One short transaction per batch, so the write lock is never held
+        # for the whole table.
+        with transaction.atomic():
+            batch = list(
+                Item.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'text')[:BATCH_SIZE]
+            )
+            for item_id, text in batch:
+                Item.objects.filter(id=item_id).update(text_hash=hashlib.sha256(text.encode()).hexdigest())
+        if len(batch) < BATCH_SIZE:
+            break
+        last_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('lists', '0002_item_text_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_text_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0003_backfill_item_text_hash'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='item',
+            unique_together={('list', 'text_hash')},
+        ),
+    ]
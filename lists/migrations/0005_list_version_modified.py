@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0004_item_unique_text_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='list',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='list',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,21 +1,38 @@
+import hashlib
+
 from django.db import models
 from django.urls import reverse
 
 
+def text_digest(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
 class List(models.Model):
+    version = models.PositiveIntegerField(default=0, editable=False)
+    modified = models.DateTimeField(auto_now=True)
+
     def get_absolute_url(self):
         return reverse('view_list', args=[self.id])
 
 
 class Item(models.Model):
     text = models.TextField()
+    text_hash = models.CharField(max_length=64, blank=True, editable=False)
     list = models.ForeignKey(List, default=None, on_delete=models.CASCADE)
 
     class Meta:
         ordering = ('id',)
-        unique_together = ('list', 'text')
+        # A fixed-width digest keeps the unique index small however long
+        # the item text gets.
+        unique_together = ('list', 'text_hash')
 
-    def __str__(self):
-        return self.text
+    def clean(self):
+        self.text_hash = text_digest(self.text)
 
+    def save(self, *args, **kwargs):
+        self.text_hash = text_digest(self.text)
+        super().save(*args, **kwargs)
 
+    def __str__(self):
+        return self.text
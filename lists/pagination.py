@@ -0,0 +1,63 @@
+import re
+
+from lists.models import Item
+
+ITEMS_PER_PAGE = 50
+# SQLite integers are signed 64-bit; a larger id overflows in the query.
+MAX_ITEM_ID = 2 ** 63 - 1
+
+_CURSOR = re.compile(r'[0-9]{1,19}')
+
+
+class ItemPage:
+    def __init__(self, items, start, has_previous, has_next):
+        self.items = items
+        self.start = start
+        self.has_previous = has_previous
+        self.has_next = has_next
+
+    @property
+    def previous_cursor(self):
+        return self.items[0].id if self.items else None
+
+    @property
+    def next_cursor(self):
+        return self.items[-1].id if self.items else None
+
+
+def get_item_page(list_id, after=None, before=None, size=ITEMS_PER_PAGE):
+    """Fetch one window of a list's items, keyed on Item.id.
+
+    The items are an index range scan on (list_id, id), so fetching them
+    costs the same wherever the page is.  ``start`` is the number of items
+    preceding the page, which keeps the template numbering continuous; it
+    takes a COUNT over those items, so it grows with the page's position.
+    """
+    items = Item.objects.filter(list_id=list_id)
+    if before is not None:
+        page = list(items.filter(id__lt=before).order_by('-id')[:size + 1])
+        has_previous = len(page) > size
+        page = page[:size][::-1]
+        has_next = True
+    else:
+        if after is not None:
+            items = items.filter(id__gt=after)
+        page = list(items[:size + 1])
+        has_next = len(page) > size
+        page = page[:size]
+        has_previous = after is not None
+    if after is None and not has_previous:
+        start = 0
+    elif page:
+        start = Item.objects.filter(list_id=list_id, id__lt=page[0].id).count()
+    else:
+        start = Item.objects.filter(list_id=list_id, id__lte=after).count()
+    return ItemPage(page, start, has_previous, has_next)
+
+
+def parse_cursor(value):
+    """Return the item id in an ?after= or ?before= value, or None if the
+    value can't be one (so the first page renders instead)."""
+    if value and _CURSOR.fullmatch(value) and int(value) <= MAX_ITEM_ID:
+        return int(value)
+    return None
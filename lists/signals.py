@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from lists.cache import reset_list, touch_list
+from lists.models import Item, List
+
+
+@receiver(post_save, sender=List)
+def reset_new_list(sender, instance, created, **kwargs):
+    # Ids of rolled-back lists get handed out again, so a new list must not
+    # inherit a table cached under its id.
+    if created:
+        reset_list(instance)
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def touch_items_list(sender, instance, **kwargs):
+    touch_list(instance.list_id)
@@ -0,0 +1,120 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from lists.api import decode_cursor, encode_cursor
+from lists.forms import DUPLICATE_ITEM_ERROR_MESSAGE, EMPTY_ITEM_ERROR_MESSAGE
+from lists.models import Item, List
+
+
+class ListDetailAPITest(TestCase):
+    def test_returns_list_with_first_page_of_items(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='item 1')
+        Item.objects.create(list=list_, text='item 2')
+        response = self.client.get(f'/api/lists/{list_.id}/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = response.json()
+        self.assertEqual(data['id'], list_.id)
+        self.assertEqual([item['text'] for item in data['items']], ['item 1', 'item 2'])
+        self.assertIsNone(data['next'])
+
+    def test_unknown_list_is_404(self):
+        response = self.client.get('/api/lists/12345/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_does_not_render_templates(self):
+        list_ = List.objects.create()
+        response = self.client.get(f'/api/lists/{list_.id}/')
+        self.assertEqual(response.templates, [])
+
+
+class ListItemsAPITest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_ = List.objects.create()
+        self.items = [Item.objects.create(list=self.list_, text=f'item {i}') for i in range(5)]
+
+    def test_pages_through_items_with_cursor(self):
+        url = f'/api/lists/{self.list_.id}/items/'
+        first = self.client.get(url, {'limit': 2}).json()
+        self.assertEqual([item['id'] for item in first['items']], [item.id for item in self.items[:2]])
+        second = self.client.get(url, {'limit': 2, 'cursor': first['next']}).json()
+        self.assertEqual([item['id'] for item in second['items']], [item.id for item in self.items[2:4]])
+        third = self.client.get(url, {'limit': 2, 'cursor': second['next']}).json()
+        self.assertEqual([item['id'] for item in third['items']], [self.items[4].id])
+        self.assertIsNone(third['next'])
+
+    def test_bad_cursor_is_400(self):
+        response = self.client.get(f'/api/lists/{self.list_.id}/items/', {'cursor': '!!!'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_past_the_largest_item_id_is_400(self):
+        response = self.client.get(f'/api/lists/{self.list_.id}/items/', {'cursor': encode_cursor(10 ** 25)})
+        self.assertEqual(response.status_code, 400)
+
+    def test_limit_past_the_largest_integer_is_400(self):
+        response = self.client.get(f'/api/lists/{self.list_.id}/items/', {'limit': 2 ** 63})
+        self.assertEqual(response.status_code, 400)
+
+    def test_can_add_item_with_json(self):
+        response = self.client.post(
+            f'/api/lists/{self.list_.id}/items/',
+            data=json.dumps({'text': 'new item'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['text'], 'new item')
+        self.assertEqual(self.list_.item_set.last().text, 'new item')
+
+    def test_needs_no_csrf_token_for_json(self):
+        response = Client(enforce_csrf_checks=True).post(
+            f'/api/lists/{self.list_.id}/items/',
+            data=json.dumps({'text': 'new item'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_rejects_form_data_which_needs_no_preflight(self):
+        response = Client(enforce_csrf_checks=True).post(
+            f'/api/lists/{self.list_.id}/items/', data={'text': 'new item'}
+        )
+        self.assertEqual(response.status_code, 415)
+        self.assertEqual(self.list_.item_set.count(), 5)
+
+    def test_json_that_is_not_an_object_is_400(self):
+        url = f'/api/lists/{self.list_.id}/items/'
+        for body in ('[1]', '"x"', '1', 'null'):
+            response = self.client.post(url, data=body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+
+    def test_rejects_bursts_of_posts(self):
+        url = f'/api/lists/{self.list_.id}/items/'
+        for i in range(20):
+            self.client.post(url, data=json.dumps({'text': f'new {i}'}), content_type='application/json')
+        response = self.client.post(url, data=json.dumps({'text': 'one too many'}), content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+
+    def test_validation_errors_are_returned(self):
+        url = f'/api/lists/{self.list_.id}/items/'
+        response = self.client.post(url, data=json.dumps({'text': ''}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors']['text'][0]['message'], EMPTY_ITEM_ERROR_MESSAGE)
+        response = self.client.post(url, data=json.dumps({'text': 'item 0'}), content_type='application/json')
+        self.assertEqual(response.json()['errors']['text'][0]['message'], DUPLICATE_ITEM_ERROR_MESSAGE)
+
+    def test_invalid_json_is_400(self):
+        response = self.client.post(
+            f'/api/lists/{self.list_.id}/items/', data='{', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class CursorTest(TestCase):
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(1234)), 1234)
+
+    def test_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            decode_cursor('bm90IGFuIGlk')
@@ -0,0 +1,76 @@
+from unittest.mock import call, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from lists import cache as list_cache
+from lists.forms import ExistingListItemForm, ItemForm
+from lists.models import Item, List
+
+
+HIT = call('superlists_cache_requests_total', cache='list_table', result='hit')
+MISS = call('superlists_cache_requests_total', cache='list_table', result='miss')
+
+
+class ListTableCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = patch('superlists.metrics.registry')
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_read_of_a_list_is_a_hit(self):
+        list_ = List.objects.create()
+        list_cache.get_list_table(list_.id)
+        list_cache.get_list_table(list_.id)
+        self.assertEqual(self.registry.inc.call_args_list, [MISS, HIT])
+
+    def test_cached_list_page_runs_no_queries(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey 1')
+        self.client.get(f'/lists/{list_.id}/')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/lists/{list_.id}/')
+        self.assertContains(response, '1: itemey 1')
+
+    def test_saving_existing_list_item_form_invalidates_table(self):
+        list_ = List.objects.create()
+        list_cache.get_list_table(list_.id)
+        ExistingListItemForm(for_list=list_, data={'text': 'new item'}).save()
+        self.assertIn('new item', list_cache.get_list_table(list_.id))
+
+    def test_saving_item_form_invalidates_table(self):
+        list_ = List.objects.create()
+        list_cache.get_list_table(list_.id)
+        ItemForm(data={'text': 'new item'}).save(for_list=list_)
+        self.assertIn('new item', list_cache.get_list_table(list_.id))
+
+    def test_deleting_item_invalidates_table(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='gone soon')
+        list_cache.get_list_table(list_.id)
+        item.delete()
+        self.assertNotIn('gone soon', list_cache.get_list_table(list_.id))
+
+    def test_new_list_does_not_inherit_table_cached_under_its_id(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='old item')
+        list_cache.get_list_table(list_.id)
+        list_id = list_.id
+        list_.delete()
+        List.objects.create(id=list_id)
+        self.assertNotIn('old item', list_cache.get_list_table(list_id))
+
+    def test_caches_pages_after_real_items_only(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='itemey')
+        for _ in range(2):
+            list_cache.get_list_table(list_.id, after=item.id + 1000)
+        self.assertEqual(self.registry.inc.call_args_list, [MISS, MISS])
+        for _ in range(2):
+            list_cache.get_list_table(list_.id, after=item.id)
+        self.assertEqual(self.registry.inc.call_args_list, [MISS, MISS, MISS, HIT])
+
+    def test_unknown_list_raises(self):
+        with self.assertRaises(List.DoesNotExist):
+            list_cache.get_list_table(12345)
@@ -0,0 +1,34 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from lists.management.commands.bench import percentile, summarize
+from lists.models import Item, List
+
+
+class DeleteEmptyListsTest(TestCase):
+    def test_deletes_only_lists_without_items(self):
+        empty_lists = [List.objects.create() for _ in range(5)]
+        kept = List.objects.create()
+        Item.objects.create(list=kept, text='keep me')
+        out = StringIO()
+        call_command('delete_empty_lists', chunk_size=2, stdout=out)
+        self.assertEqual(list(List.objects.all()), [kept])
+        self.assertIn(f'Deleted {len(empty_lists)} empty lists', out.getvalue())
+
+
+class BenchSummaryTest(TestCase):
+    def test_percentile_uses_nearest_rank(self):
+        timings = list(range(1, 101))
+        self.assertEqual(percentile(timings, 0.5), 50)
+        self.assertEqual(percentile(timings, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_summarize(self):
+        result = summarize([0.002, 0.001, 0.003, 0.004], [200, 302, 500, 200], [2, 4], elapsed=2)
+        self.assertEqual(result['requests'], 4)
+        self.assertEqual(result['errors'], 1)
+        self.assertEqual(result['requests_per_second'], 2)
+        self.assertEqual(result['p50_ms'], 2)
+        self.assertEqual(result['queries_per_request'], 3)
@@ -1,7 +1,12 @@
+from unittest.mock import patch
+
 from django.test import TestCase
 
-from lists.forms import ItemForm, ExistingListItemForm, EMPTY_ITEM_ERROR_MESSAGE, DUPLICATE_ITEM_ERROR_MESSAGE
-from lists.models import Item, List
+from lists.forms import (
+    ItemForm, ExistingListItemForm, BulkItemForm, EMPTY_ITEM_ERROR_MESSAGE, DUPLICATE_ITEM_ERROR_MESSAGE,
+    MAX_BULK_ITEMS, TOO_MANY_ITEMS_ERROR_MESSAGE
+)
+from lists.models import Item, List, text_digest
 
 
 class ItemFormTest(TestCase):
@@ -48,3 +53,45 @@ class ExistingListItemFormTest(TestCase):
         form = ExistingListItemForm(for_list=list_, data={'text': 'hi'})
         new_item = form.save()
         self.assertEqual(new_item, Item.objects.all()[0])
+
+
+class BulkItemFormTest(TestCase):
+    def test_form_validation_for_blank_lines_only(self):
+        list_ = List.objects.create()
+        form = BulkItemForm(for_list=list_, data={'texts': '\n  \n'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['texts'], [EMPTY_ITEM_ERROR_MESSAGE])
+
+    def test_form_validation_for_too_many_items(self):
+        list_ = List.objects.create()
+        texts = '\n'.join(f'item {i}' for i in range(MAX_BULK_ITEMS + 1))
+        form = BulkItemForm(for_list=list_, data={'texts': texts})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['texts'], [TOO_MANY_ITEMS_ERROR_MESSAGE])
+
+    def test_form_save_skips_empties_and_duplicates(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='already there')
+        form = BulkItemForm(for_list=list_, data={'texts': 'a\n\nalready there\nb\na\n'})
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.assertEqual([item.text for item in list_.item_set.all()], ['already there', 'a', 'b'])
+
+    def test_form_save_retries_when_a_concurrent_post_added_an_item(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='a')
+        form = BulkItemForm(for_list=list_, data={'texts': 'a\nb'})
+        self.assertTrue(form.is_valid())
+        # The first check misses 'a', as if it was committed just after.
+        with patch.object(BulkItemForm, '_existing_hashes', side_effect=[set(), {text_digest('a')}]):
+            form.save()
+        self.assertEqual([item.text for item in list_.item_set.all()], ['a', 'b'])
+
+    def test_form_save_uses_one_select_and_one_insert(self):
+        list_ = List.objects.create()
+        form = BulkItemForm(for_list=list_, data={'texts': '\n'.join(f'item {i}' for i in range(30))})
+        self.assertTrue(form.is_valid())
+        # SAVEPOINT, SELECT, INSERT, list UPDATE, RELEASE SAVEPOINT
+        with self.assertNumQueries(5):
+            form.save()
+        self.assertEqual(list_.item_set.count(), 30)
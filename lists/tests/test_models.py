@@ -1,7 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
-from lists.models import Item, List
+from lists.models import Item, List, text_digest
 
 
 class ItemModelTest(TestCase):
@@ -43,6 +43,17 @@ class ItemModelTest(TestCase):
         item = Item(list=list2, text='bla')
         item.full_clean()
 
+    def test_duplicate_long_items_are_invalid(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='bla' * 10000)
+        with self.assertRaises(ValidationError):
+            Item(list=list_, text='bla' * 10000).full_clean()
+
+    def test_saving_stores_text_digest(self):
+        list_ = List.objects.create()
+        item = Item.objects.create(list=list_, text='bla')
+        self.assertEqual(Item.objects.get(id=item.id).text_hash, text_digest('bla'))
+
     def test_string_representation(self):
         item = Item(text='some text')
         self.assertEqual(str(item), 'some text')
@@ -0,0 +1,53 @@
+from django.test import TestCase
+
+from lists.models import Item, List
+from lists.pagination import get_item_page, parse_cursor
+
+
+class ItemPageTest(TestCase):
+    def setUp(self):
+        self.list_ = List.objects.create()
+        self.items = [Item.objects.create(list=self.list_, text=f'item {i}') for i in range(7)]
+
+    def test_first_page(self):
+        page = get_item_page(self.list_.id, size=3)
+        self.assertEqual(page.items, self.items[:3])
+        self.assertEqual(page.start, 0)
+        self.assertFalse(page.has_previous)
+        self.assertTrue(page.has_next)
+
+    def test_page_after_cursor_knows_its_start(self):
+        page = get_item_page(self.list_.id, after=self.items[2].id, size=3)
+        self.assertEqual(page.items, self.items[3:6])
+        self.assertEqual(page.start, 3)
+        self.assertTrue(page.has_previous)
+        self.assertTrue(page.has_next)
+
+    def test_last_page(self):
+        page = get_item_page(self.list_.id, after=self.items[5].id, size=3)
+        self.assertEqual(page.items, self.items[6:])
+        self.assertFalse(page.has_next)
+
+    def test_page_before_cursor(self):
+        page = get_item_page(self.list_.id, before=self.items[6].id, size=3)
+        self.assertEqual(page.items, self.items[3:6])
+        self.assertEqual(page.start, 3)
+        self.assertTrue(page.has_previous)
+        self.assertTrue(page.has_next)
+
+    def test_page_before_cursor_reaching_the_start(self):
+        page = get_item_page(self.list_.id, before=self.items[2].id, size=3)
+        self.assertEqual(page.items, self.items[:2])
+        self.assertEqual(page.start, 0)
+        self.assertFalse(page.has_previous)
+
+    def test_only_includes_items_of_that_list(self):
+        other_list = List.objects.create()
+        Item.objects.create(list=other_list, text='other')
+        page = get_item_page(other_list.id, size=3)
+        self.assertEqual([item.text for item in page.items], ['other'])
+
+    def test_parse_cursor_ignores_garbage(self):
+        self.assertEqual(parse_cursor('12'), 12)
+        self.assertIsNone(parse_cursor('abc'))
+        self.assertIsNone(parse_cursor(None))
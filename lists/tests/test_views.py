@@ -1,8 +1,14 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import IntegrityError
 from django.test import TestCase
 from django.utils.html import escape
 
 from lists.forms import ItemForm, ExistingListItemForm, EMPTY_ITEM_ERROR_MESSAGE, DUPLICATE_ITEM_ERROR_MESSAGE
 from lists.models import Item, List
+from lists.pagination import ITEMS_PER_PAGE
 
 
 class HomePageTest(TestCase):
@@ -15,7 +21,28 @@ class HomePageTest(TestCase):
         self.assertIsInstance(response.context['form'], ItemForm)
 
 
+class NavbarTest(TestCase):
+    multi_db = True
+
+    def setUp(self):
+        caches['fragments'].clear()
+
+    def test_cached_navbar_is_per_user(self):
+        User = get_user_model()
+        for email in ('edith@example.com', 'oni@example.com'):
+            self.client.force_login(User.objects.create(email=email))
+            response = self.client.get('/')
+            self.assertContains(response, f'Logged in as {email}')
+
+    def test_login_form_is_not_cached(self):
+        response = self.client.get('/')
+        self.assertContains(response, 'csrfmiddlewaretoken')
+
+
 class NewListTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_for_invalid_input_renders_home_template(self):
         response = self.client.post('/lists/new', data={'text': ''})
         self.assertEqual(response.status_code, 200)
@@ -29,8 +56,31 @@ class NewListTest(TestCase):
         response = self.client.post('/lists/new', data={'text': ''})
         self.assertIsInstance(response.context['form'], ItemForm)
 
+    def test_creates_list_and_item_in_two_statements(self):
+        # SAVEPOINT, list INSERT, item INSERT, RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            self.client.post('/lists/new', data={'text': 'A new list item'})
+        self.assertEqual(List.objects.first().item_set.get().text, 'A new list item')
+
+    def test_rejects_bursts_from_one_ip(self):
+        for i in range(20):
+            self.client.post('/lists/new', data={'text': f'item {i}'}, REMOTE_ADDR='10.0.0.1')
+        response = self.client.post('/lists/new', data={'text': 'one too many'}, REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post('/lists/new', data={'text': 'someone else'}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 302)
+
+    def test_failed_item_insert_leaves_no_list(self):
+        with patch('lists.forms.Item.objects.bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.client.post('/lists/new', data={'text': 'A new list item'})
+        self.assertEqual(List.objects.count(), 0)
+
 
 class ListViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_displays_item_form(self):
         list_ = List.objects.create()
         response = self.client.get(f'/lists/{list_.id}/')
@@ -131,6 +181,113 @@ class ListViewTest(TestCase):
         response = self.client.get(f'/lists/{list_.id}/')
         self.assertEqual(response.context['list'], list_)
 
+    def test_numbers_items_continuously_across_pages(self):
+        list_ = List.objects.create()
+        items = [Item.objects.create(list=list_, text=f'itemey {i}') for i in range(ITEMS_PER_PAGE + 2)]
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertNotContains(response, f'itemey {ITEMS_PER_PAGE}')
+        self.assertContains(response, f'?after={items[ITEMS_PER_PAGE - 1].id}')
+
+        response = self.client.get(f'/lists/{list_.id}/?after={items[ITEMS_PER_PAGE - 1].id}')
+        self.assertContains(response, f'{ITEMS_PER_PAGE + 1}: itemey {ITEMS_PER_PAGE}')
+        self.assertContains(response, f'{ITEMS_PER_PAGE + 2}: itemey {ITEMS_PER_PAGE + 1}')
+        self.assertNotContains(response, 'itemey 0<')
+
+    def test_cursors_that_are_not_item_ids_show_first_page(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey 1')
+        for cursor in ['\u00b2', '99999999999999999999999']:
+            response = self.client.get(f'/lists/{list_.id}/', {'after': cursor, 'before': cursor})
+            self.assertContains(response, '1: itemey 1')
+
     def post_invalid_input(self):
         list_ = List.objects.create()
-        return self.client.post(f'/lists/{list_.id}/', data={'text': ''})
\ No newline at end of file
+        return self.client.post(f'/lists/{list_.id}/', data={'text': ''})
+
+
+class BulkAddItemsTest(TestCase):
+    def test_saves_all_lines_and_redirects(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/bulk', data={'texts': 'one\ntwo\nthree'})
+        self.assertRedirects(response, f'/lists/{list_.id}/')
+        self.assertEqual([item.text for item in list_.item_set.all()], ['one', 'two', 'three'])
+
+    def test_new_items_show_up_on_list_page(self):
+        list_ = List.objects.create()
+        self.client.get(f'/lists/{list_.id}/')
+        self.client.post(f'/lists/{list_.id}/bulk', data={'texts': 'one\ntwo'})
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertContains(response, '2: two')
+
+    def test_for_invalid_input_shows_error_on_list_page(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/bulk', data={'texts': ''})
+        self.assertTemplateUsed(response, 'list.html')
+        self.assertContains(response, escape(EMPTY_ITEM_ERROR_MESSAGE))
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_only_accepts_post(self):
+        list_ = List.objects.create()
+        response = self.client.get(f'/lists/{list_.id}/bulk')
+        self.assertEqual(response.status_code, 405)
+
+    def test_rejects_bursts_from_one_ip(self):
+        list_ = List.objects.create()
+        for i in range(20):
+            self.client.post(f'/lists/{list_.id}/bulk', data={'texts': f'item {i}'}, REMOTE_ADDR='10.0.0.3')
+        response = self.client.post(f'/lists/{list_.id}/bulk', data={'texts': 'one too many'}, REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Item.objects.count(), 20)
+
+
+class ConditionalListViewTest(TestCase):
+    multi_db = True
+
+    def test_list_page_has_etag_and_last_modified(self):
+        list_ = List.objects.create()
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_unchanged_list_is_not_modified(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey 1')
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_item_changes_etag(self):
+        list_ = List.objects.create()
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        self.client.post(f'/lists/{list_.id}/', data={'text': 'itemey 1'})
+        response = self.client.get(f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'itemey 1')
+
+    def test_if_modified_since(self):
+        list_ = List.objects.create()
+        last_modified = self.client.get(f'/lists/{list_.id}/')['Last-Modified']
+        self.client.cookies.clear()
+        response = self.client.get(f'/lists/{list_.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_no_last_modified_once_the_page_holds_a_csrf_token(self):
+        list_ = List.objects.create()
+        self.client.get(f'/lists/{list_.id}/')
+        response = self.client.get(f'/lists/{list_.id}/')
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_logging_in_changes_etag(self):
+        list_ = List.objects.create()
+        etag = self.client.get(f'/lists/{list_.id}/')['ETag']
+        self.client.force_login(get_user_model().objects.create(email='edith@example.com'))
+        response = self.client.get(f'/lists/{list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'edith@example.com')
+
+    def test_item_writes_bump_list_version(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey 1')
+        list_.refresh_from_db()
+        self.assertEqual(list_.version, 1)
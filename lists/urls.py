@@ -5,4 +5,5 @@ from . import views
 urlpatterns = [
     url(r'^new$', views.new_list, name='new_list'),
     url(r'^(\d+)/$', views.view_list, name='view_list'),
+    url(r'^(\d+)/bulk$', views.bulk_add_items, name='bulk_add_items'),
 ]
@@ -1,28 +1,83 @@
+import hashlib
+
+from django.conf import settings
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect, render
+from django.views.decorators.http import condition, require_POST
 
-from lists.forms import ItemForm, ExistingListItemForm
+from lists.cache import get_list_state, get_list_table
+from lists.forms import BulkItemForm, ItemForm, ExistingListItemForm
 from lists.models import List
+from lists.pagination import parse_cursor
+from superlists.ratelimit import client_ip, rate_limit
 
 
 def home_page(request):
     return render(request, 'home.html', {'form': ItemForm()})
 
 
+def _list_etag(request, list_id):
+    # The page also holds the navbar and a CSRF token, and logging in
+    # changes both, so the ETag covers the user and the CSRF cookie too:
+    # get_token leaves the value this response's cookie will have in META.
+    if request.method == 'GET':
+        version = get_list_state(list_id)['version']
+        get_token(request)
+        csrf_cookie = request.META['CSRF_COOKIE']
+        return hashlib.sha256(f'{version}:{request.user.pk}:{csrf_cookie}'.encode()).hexdigest()
+
+
+def _list_last_modified(request, list_id):
+    # A date can't tell those pages apart, so it is only a validator for
+    # visitors who have neither a session nor a CSRF token yet.
+    if request.method == 'GET' and not (
+        settings.SESSION_COOKIE_NAME in request.COOKIES or settings.CSRF_COOKIE_NAME in request.COOKIES
+    ):
+        return get_list_state(list_id)['modified']
+
+
+@condition(etag_func=_list_etag, last_modified_func=_list_last_modified)
 def view_list(request, list_id):
-    list_ = List.objects.get(id=list_id)
-    form = ExistingListItemForm(for_list=list_)
     if request.method == 'POST':
+        list_ = List.objects.get(id=list_id)
         form = ExistingListItemForm(for_list=list_, data=request.POST)
         if form.is_valid():
             form.save()
             return redirect(list_)
-    return render(request, 'list.html', {'list': list_, 'form': form})
+    else:
+        # get_list_table raises List.DoesNotExist for unknown ids, so on a
+        # cache hit the list row itself never needs to be fetched.
+        list_ = List(id=int(list_id))
+        form = ExistingListItemForm(for_list=list_)
+    return _render_list(request, list_, form, BulkItemForm(for_list=list_))
+
+
+@rate_limit('bulk_add_items', keys=(client_ip,))
+@require_POST
+def bulk_add_items(request, list_id):
+    list_ = List.objects.get(id=list_id)
+    bulk_form = BulkItemForm(for_list=list_, data=request.POST)
+    if bulk_form.is_valid():
+        bulk_form.save()
+        return redirect(list_)
+    return _render_list(request, list_, ExistingListItemForm(for_list=list_), bulk_form)
+
+
+def _render_list(request, list_, form, bulk_form):
+    table = get_list_table(
+        list_.id,
+        after=parse_cursor(request.GET.get('after')),
+        before=parse_cursor(request.GET.get('before')),
+    )
+    return render(request, 'list.html', {
+        'list': list_, 'form': form, 'bulk_form': bulk_form, 'table': table
+    })
 
 
+@rate_limit('new_list', keys=(client_ip,))
 def new_list(request):
     form = ItemForm(data=request.POST)
     if form.is_valid():
-        list_ = List.objects.create()
-        form.save(for_list=list_)
+        list_ = form.save_as_new_list()
         return redirect(list_)
     return render(request, 'home.html', {'form': form})
@@ -0,0 +1,161 @@
+"""Per-view request metrics and cache hit counts, shared between gunicorn
+workers.
+
+Each worker adds up its observations in memory and every
+METRICS_FLUSH_INTERVAL seconds adds them to a small SQLite file, in one
+transaction of plain INSERT OR IGNORE and UPDATE statements that any SQLite
+3 understands.  The /metrics view reads the totals of all workers, past and
+present, from that file in the Prometheus text format.
+"""
+import collections
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack, closing
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+METRIC_TYPES = {
+    'superlists_requests_total': 'counter',
+    'superlists_request_duration_seconds': 'histogram',
+    'superlists_request_queries': 'histogram',
+    'superlists_query_duration_seconds_total': 'counter',
+    'superlists_cache_requests_total': 'counter',
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _labels(**labels):
+    return ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for name, value in sorted(labels.items())
+    )
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+class Registry:
+    def __init__(self):
+        self._pending = collections.Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _observe_histogram(self, name, buckets, value, **labels):
+        # Prometheus buckets are cumulative: a value lands in every bucket
+        # whose upper bound is at least that value.  The others get 0, so a
+        # histogram's series all exist from its first observation on.
+        for bound in buckets:
+            key = (f'{name}_bucket', _labels(le=_format_bound(bound), **labels))
+            self._pending[key] += 1 if value <= bound else 0
+        self._pending[(f'{name}_bucket', _labels(le='+Inf', **labels))] += 1
+        self._pending[(f'{name}_sum', _labels(**labels))] += value
+        self._pending[(f'{name}_count', _labels(**labels))] += 1
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._pending[(name, _labels(**labels))] += value
+
+    def observe_request(self, view, method, status, duration, queries, query_duration):
+        with self._lock:
+            self._pending[('superlists_requests_total', _labels(view=view, method=method, status=status))] += 1
+            self._observe_histogram('superlists_request_duration_seconds', DURATION_BUCKETS, duration, view=view)
+            self._observe_histogram('superlists_request_queries', QUERY_BUCKETS, queries, view=view)
+            self._pending[('superlists_query_duration_seconds_total', _labels(view=view))] += query_duration
+
+    def flush(self, force=False):
+        with self._lock:
+            if not force and time.monotonic() - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+                return
+            pending, self._pending = self._pending, collections.Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        # Runs in the request path: a locked or unwritable file must not
+        # fail the response, so the observations wait for the next flush.
+        try:
+            with closing(_connect()) as db, db:
+                db.executemany(
+                    'INSERT OR IGNORE INTO metrics (name, labels, value) VALUES (?, ?, 0)', list(pending)
+                )
+                db.executemany(
+                    'UPDATE metrics SET value = value + ? WHERE name = ? AND labels = ?',
+                    [(value, name, labels) for (name, labels), value in pending.items()]
+                )
+        except sqlite3.Error:
+            logger.exception('Could not write metrics to %s', settings.METRICS_DB)
+            with self._lock:
+                self._pending.update(pending)
+
+
+def _connect():
+    db = sqlite3.connect(settings.METRICS_DB, timeout=1)
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS metrics '
+        '(name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, PRIMARY KEY (name, labels))'
+    )
+    return db
+
+
+registry = Registry()
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+        query_duration = 0
+
+        def timed_execute(execute, sql, params, many, context):
+            nonlocal queries, query_duration
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries += 1
+                query_duration += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(timed_execute))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.observe_request(view, request.method, response.status_code, duration, queries, query_duration)
+        registry.flush()
+        return response
+
+
+def render_metrics():
+    registry.flush(force=True)
+    with closing(_connect()) as db:
+        rows = db.execute('SELECT name, labels, value FROM metrics ORDER BY name, labels').fetchall()
+    lines = []
+    typed = set()
+    for name, labels, value in rows:
+        base = name
+        for suffix in ('_bucket', '_sum', '_count'):
+            if name.endswith(suffix) and name[:-len(suffix)] in METRIC_TYPES:
+                base = name[:-len(suffix)]
+        if base not in typed:
+            typed.add(base)
+            lines.append(f'# TYPE {base} {METRIC_TYPES.get(base, "untyped")}')
+        lines.append(f'{name}{{{labels}}} {value:g}' if labels else f'{name} {value:g}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics(request):
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
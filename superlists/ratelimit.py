@@ -0,0 +1,64 @@
+import functools
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+def client_ip(request):
+    # gunicorn only listens on a unix socket behind nginx, which sets X-Real-IP.
+    return request.META.get('HTTP_X_REAL_IP') or request.META.get('REMOTE_ADDR')
+
+
+def posted_email(request):
+    email = request.POST.get('email', '').strip().lower()
+    return email or None
+
+
+def _take_tokens(cache, keys, capacity, refill_rate, now):
+    """Take one token from each bucket, or return how long to wait for one.
+
+    Buckets are (tokens, timestamp) pairs in the cache, so every worker
+    shares them.  The read-modify-write isn't atomic: concurrent requests
+    can slip one or two over the limit, never far past it.
+    """
+    buckets = cache.get_many(keys)
+    refilled = {}
+    for key in keys:
+        tokens, stamp = buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - stamp) * refill_rate)
+        if tokens < 1:
+            return (1 - tokens) / refill_rate
+        refilled[key] = (tokens - 1, now)
+    cache.set_many(refilled, timeout=math.ceil(capacity / refill_rate))
+    return 0
+
+
+def rate_limit(name, keys):
+    """Reject requests with 429 once any of their token buckets runs dry.
+
+    ``keys`` are functions of the request; each non-None value gets its own
+    bucket, sized by settings.RATE_LIMITS[name].  Only POSTs are limited.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            limit = settings.RATE_LIMITS.get(name)
+            if limit and request.method == 'POST':
+                bucket_keys = [
+                    f'ratelimit:{name}:{key.__name__}:{value}'
+                    for key, value in ((key, key(request)) for key in keys) if value is not None
+                ]
+                retry_after = _take_tokens(
+                    caches[settings.RATE_LIMIT_CACHE], bucket_keys,
+                    limit['capacity'], limit['refill_per_second'], time.time()
+                )
+                if retry_after:
+                    response = HttpResponse('Too many requests, slow down.', status=429)
+                    response['Retry-After'] = math.ceil(retry_after)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
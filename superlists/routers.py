@@ -0,0 +1,23 @@
+from django.conf import settings
+
+
+class AppDatabaseRouter:
+    """Send each app listed in DATABASE_APPS_MAPPING to its own database.
+
+    Apps that aren't listed stay on 'default'.
+    """
+
+    def _db_for_app(self, app_label):
+        return settings.DATABASE_APPS_MAPPING.get(app_label, 'default')
+
+    def db_for_read(self, model, **hints):
+        return self._db_for_app(model._meta.app_label)
+
+    def db_for_write(self, model, **hints):
+        return self._db_for_app(model._meta.app_label)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return self._db_for_app(obj1._meta.app_label) == self._db_for_app(obj2._meta.app_label)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == self._db_for_app(app_label)
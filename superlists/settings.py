@@ -42,11 +42,15 @@ INSTALLED_APPS = [
 ]
 
 AUTH_USER_MODEL = 'accounts.User'
+LOGIN_TOKEN_TTL = 60 * 60
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 5 * 60
 AUTHENTICATION_BACKENDS = [
     'accounts.authentication.PasswordlessAuthenticationBackend',
 ]
 
 MIDDLEWARE = [
+    'superlists.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,11 +62,17 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'superlists.urls'
 
+TEST_RUNNER = 'superlists.testrunner.TestRunner'
+
+_TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -70,6 +80,10 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Parse each template once per process, except while developing.
+            'loaders': _TEMPLATE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader', _TEMPLATE_LOADERS),
+            ],
         },
     },
 ]
@@ -80,12 +94,93 @@ WSGI_APPLICATION = 'superlists.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/1.11/ref/settings/#databases
 
+# WAL lets readers carry on while a gunicorn worker writes, and with
+# synchronous=NORMAL a commit no longer waits for an fsync of the database.
+
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),
+}
+
+SQLITE_DATABASE = {
+    'ENGINE': 'superlists.sqlite3',
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+    'OPTIONS': {
+        'pragmas': SQLITE_PRAGMAS,
+    },
+}
+
+# Login tokens, sessions and list items each get their own file, so their
+# writers don't queue on one SQLite write lock.
+
 DATABASES = {
+    'default': {**SQLITE_DATABASE, 'NAME': os.path.join(BASE_DIR, '../database/db.sqlite3')},
+    'accounts': {**SQLITE_DATABASE, 'NAME': os.path.join(BASE_DIR, '../database/accounts.sqlite3')},
+    'sessions': {**SQLITE_DATABASE, 'NAME': os.path.join(BASE_DIR, '../database/sessions.sqlite3')},
+}
+
+DATABASE_ROUTERS = ['superlists.routers.AppDatabaseRouter']
+DATABASE_APPS_MAPPING = {
+    'accounts': 'accounts',
+    'sessions': 'sessions',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/2.1/topics/cache/
+# File based so that every gunicorn worker sees the same list versions.
+# The one directory holds list states, rendered list tables (one per page),
+# cached_db sessions and rate-limit buckets.  Once MAX_ENTRIES is reached a
+# third of it is culled at random, so size it for the site's active lists
+# and sessions; every set lists the directory, so don't size it far beyond.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, '../database/db.sqlite3'),
-    }
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, '../cache'),
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
+    # Template fragments only depend on their keys, so each worker can keep
+    # its own copies in memory.
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'TIMEOUT': 60 * 10,
+    },
+}
+
+# Request metrics of every worker are summed in this file and served at /metrics.
+METRICS_DB = os.path.join(BASE_DIR, '../database/metrics.sqlite3')
+METRICS_FLUSH_INTERVAL = 5
+
+# Rate limits
+# Token buckets per client IP and per email: up to `capacity` requests at
+# once, refilled at `refill_per_second`.
+
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMITS = {
+    'send_login_email': {'capacity': 5, 'refill_per_second': 5 / 60},
+    'new_list': {'capacity': 20, 'refill_per_second': 1},
+    'bulk_add_items': {'capacity': 20, 'refill_per_second': 1},
+    'api_add_item': {'capacity': 20, 'refill_per_second': 1},
+}
+
+
+# Sessions
+# SESSION_BACKEND picks the engine; benchmarks/sessions.py compares them.
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
 }
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('SESSION_BACKEND', 'cached_db')]
 
 
 # Password validation
@@ -126,6 +221,16 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.abspath(os.path.join(BASE_DIR, '../static'))
+STATICFILES_STORAGE = 'superlists.storage.CompressedManifestStaticFilesStorage'
+
+# Requests only queue their mail; `manage.py send_queued_mail` delivers it
+# through MAIL_QUEUE_EMAIL_BACKEND.
+EMAIL_BACKEND = 'accounts.mail.QueuedEmailBackend'
+MAIL_QUEUE_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+MAIL_QUEUE_BATCH_SIZE = 50
+MAIL_QUEUE_POLL_INTERVAL = 1
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_DELAY = 30
 
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_HOST_USER = os.environ.get('EMAIL_USER')
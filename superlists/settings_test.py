@@ -0,0 +1,26 @@
+"""Settings for the unit tests, which keep everything in memory:
+
+    python manage.py test lists accounts superlists --settings=superlists.settings_test --parallel
+
+--parallel needs tblib to report failures.  Caches and the metrics database
+are swapped for in-memory ones by the test runner under any settings.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+
+for database in DATABASES.values():
+    database['TEST'] = {'NAME': ':memory:'}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+MAIL_QUEUE_EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+TEST_RUNNER = 'superlists.testrunner.TimedTestRunner'
+# Seconds the whole run may take, setup included, before it counts as failed;
+# it takes about 2.5s on one CPU, so this leaves room for a slower machine,
+# not for a test that sleeps or a fixture that grew by an order of magnitude.
+# Slow CI boxes can raise it with TEST_RUNTIME_TARGET, or set 0 to turn the
+# check off.
+TEST_RUNTIME_TARGET = float(os.environ.get('TEST_RUNTIME_TARGET', 5))
@@ -0,0 +1,19 @@
+"""SQLite backend that applies PRAGMAs from OPTIONS['pragmas'] to every new connection."""
+from django.db.backends.sqlite3 import base
+
+PRAGMA_NAMES = {'journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size', 'temp_store'}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop('pragmas', None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict['OPTIONS'].get('pragmas', {}).items():
+            if name not in PRAGMA_NAMES:
+                raise ValueError(f'Unsupported SQLite pragma: {name}')
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
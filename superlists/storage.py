@@ -0,0 +1,36 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.html', '.txt')
+MIN_COMPRESS_SIZE = 1024
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest-hashed static files with a .gz copy for nginx's gzip_static."""
+
+    def stored_name(self, name):
+        # Without a manifest collectstatic hasn't run (tests, a fresh
+        # checkout), so the finders serve the files under their own names.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not dry_run and hashed_name and not isinstance(processed, Exception):
+                for path in (name, hashed_name):
+                    self._write_gzipped(path)
+            yield name, hashed_name, processed
+
+    def _write_gzipped(self, name):
+        path = self.path(name)
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS) or os.path.getsize(path) < MIN_COMPRESS_SIZE:
+            return
+        with open(path, 'rb') as original:
+            content = original.read()
+        compressed = gzip.compress(content, compresslevel=9)
+        if len(compressed) < len(content):
+            with open(path + '.gz', 'wb') as gzipped:
+                gzipped.write(compressed)
@@ -0,0 +1,147 @@
+"""Query budgets and render-time ceilings for the user-facing views.
+
+The budgets are exact: a view that starts running one more query per item
+or per request fails here before it reaches the site.  The fixtures hold
+enough lists and items that an N+1 pattern would run dozens of extra
+queries.  The time ceilings are loose, they only catch gross regressions.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.authentication import user_cache
+from accounts.models import Token, User
+from lists.models import Item, List, text_digest
+from lists.pagination import ITEMS_PER_PAGE
+
+LARGE_LIST_ITEMS = ITEMS_PER_PAGE * 10
+SMALL_LIST_ITEMS = 3
+
+
+class QueryBudgetTest(TestCase):
+    multi_db = True
+
+    @classmethod
+    def setUpTestData(cls):
+        List.objects.bulk_create(List() for _ in range(50))
+        cls.small_list, cls.large_list = List.objects.all()[:2]
+        Item.objects.bulk_create(
+            Item(list_id=list_id, text=f'item {i}', text_hash=text_digest(f'item {i}'))
+            for list_id in List.objects.values_list('id', flat=True)
+            for i in range(LARGE_LIST_ITEMS if list_id == cls.large_list.id else SMALL_LIST_ITEMS)
+        )
+        User.objects.bulk_create(User(email=f'user{i}@example.com') for i in range(50))
+        cls.user = User.objects.get(email='user0@example.com')
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Run every view once, so first-use imports and template compiling
+        # in a fresh (e.g. --parallel) process stay out of the timed blocks.
+        # Their writes are rolled back; setUp clears the caches.
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(transaction.atomic(using=alias))
+            client = cls.client_class()
+            client.get('/')
+            client.post('/lists/new', data={'text': 'warm-up'})
+            client.get(cls.large_list.get_absolute_url())
+            client.get(f'{cls.large_list.get_absolute_url()}?after={Item.objects.order_by("id")[1].id}')
+            client.post(cls.large_list.get_absolute_url(), data={'text': 'warm-up'})
+            client.post('/accounts/send_login_email', data={'email': cls.user.email})
+            client.get(f'/accounts/login?token={Token.objects.get().uid}')
+            client.get('/accounts/logout')
+            for alias in connections:
+                transaction.set_rollback(True, using=alias)
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['fragments'].clear()
+        user_cache.clear()
+
+    @contextmanager
+    def assertBudget(self, milliseconds, **queries):
+        """Run exactly `queries[alias]` queries on each database (none where
+        not given) within `milliseconds`."""
+        with ExitStack() as stack:
+            captured = {
+                alias: stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections
+            }
+            start = time.perf_counter()
+            yield
+            elapsed = (time.perf_counter() - start) * 1000
+        for alias, context in captured.items():
+            self.assertEqual(
+                len(context), queries.get(alias, 0),
+                f'{len(context)} queries on {alias}, expected {queries.get(alias, 0)}:\n' +
+                '\n'.join(query['sql'] for query in context.captured_queries)
+            )
+        self.assertLess(elapsed, milliseconds, f'took {elapsed:.1f}ms')
+
+    def test_home_page(self):
+        with self.assertBudget(100):
+            self.client.get('/')
+
+    def test_home_page_logged_in(self):
+        self.client.force_login(self.user)
+        self.client.get('/')
+        # Both the session and the user come from caches.
+        with self.assertBudget(100):
+            self.client.get('/')
+
+    def test_new_list(self):
+        # SAVEPOINT, list INSERT, item INSERT, RELEASE SAVEPOINT
+        with self.assertBudget(100, default=4):
+            self.client.post('/lists/new', data={'text': 'A new list item'})
+
+    def test_view_small_list(self):
+        # List state, list, one page of items
+        with self.assertBudget(100, default=3):
+            response = self.client.get(self.small_list.get_absolute_url())
+        self.assertContains(response, 'item 2')
+
+    def test_view_large_list(self):
+        with self.assertBudget(200, default=3):
+            response = self.client.get(self.large_list.get_absolute_url())
+        self.assertContains(response, f'item {ITEMS_PER_PAGE - 1}')
+
+    def test_view_large_list_cached(self):
+        self.client.get(self.large_list.get_absolute_url())
+        with self.assertBudget(50):
+            self.client.get(self.large_list.get_absolute_url())
+
+    def test_view_later_page_of_large_list(self):
+        url = f'{self.large_list.get_absolute_url()}?after={Item.objects.order_by("id")[ITEMS_PER_PAGE].id}'
+        # ... the count of earlier items, to number the page, and the check
+        # that the cursor is one of the list's items before caching the page
+        with self.assertBudget(200, default=5):
+            self.client.get(url)
+
+    def test_add_item_to_large_list(self):
+        # List, duplicate check, item INSERT, version UPDATE
+        with self.assertBudget(200, default=4):
+            self.client.post(self.large_list.get_absolute_url(), data={'text': 'one more'})
+
+    def test_send_login_email(self):
+        # Token INSERT; the test runner swaps the mail queue for locmem.
+        with self.assertBudget(100, accounts=1):
+            self.client.post('/accounts/send_login_email', data={'email': 'edith@example.com'})
+
+    def test_login(self):
+        token = Token.objects.create(email=self.user.email)
+        # Token lookup, then in a savepoint the token DELETE and the user.
+        # Session: existence check, INSERT and the UPDATE once logged in,
+        # both writes in savepoints.
+        with self.assertBudget(100, accounts=5, sessions=7):
+            self.client.get(f'/accounts/login?token={token.uid}')
+
+    def test_logout(self):
+        self.client.force_login(self.user)
+        self.client.get('/')
+        # Django's database session store fetches the row to delete it.
+        with self.assertBudget(100, sessions=2):
+            self.client.get('/accounts/logout')
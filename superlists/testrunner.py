@@ -0,0 +1,43 @@
+import sys
+import time
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Keeps test runs out of the site's file cache and metrics database,
+    the way Django swaps in the locmem email backend."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.isolated_settings = override_settings(
+            CACHES={
+                alias: {**config, 'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': alias}
+                for alias, config in settings.CACHES.items()
+            },
+            # Every connection to ':memory:' is a new, empty database, so the
+            # metrics the tests generate are thrown away.
+            METRICS_DB=':memory:',
+        )
+        self.isolated_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.isolated_settings.disable()
+        super().teardown_test_environment(**kwargs)
+
+
+class TimedTestRunner(TestRunner):
+    """Fails a run that takes longer than settings.TEST_RUNTIME_TARGET
+    seconds, unless the target is unset or 0."""
+
+    def run_tests(self, test_labels, extra_tests=None, **kwargs):
+        start = time.monotonic()
+        failures = super().run_tests(test_labels, extra_tests, **kwargs)
+        elapsed = time.monotonic() - start
+        target = getattr(settings, 'TEST_RUNTIME_TARGET', None)
+        if target and elapsed > target:
+            sys.stderr.write(f'Tests took {elapsed:.1f}s, over the target of {target:g}s\n')
+            failures += 1
+        return failures
@@ -0,0 +1,162 @@
+import gzip
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.db import connection, router
+from django.test import TestCase, override_settings
+
+from accounts.models import Token, User
+from lists.models import Item, List
+from superlists.metrics import Registry
+from superlists.ratelimit import _take_tokens
+from superlists.storage import CompressedManifestStaticFilesStorage
+from superlists.warmup import warm_up
+
+
+class SQLitePragmaTest(TestCase):
+    def test_pragmas_are_applied_to_new_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class MigrationsTest(TestCase):
+    multi_db = True
+
+    def test_committed_migrations_match_the_models(self):
+        # Deploys only run migrate, so a model change without its migration
+        # would never reach the database.
+        call_command('makemigrations', check=True, dry_run=True, verbosity=0)
+
+
+class AppDatabaseRouterTest(TestCase):
+    def test_models_are_routed_to_their_apps_database(self):
+        self.assertEqual(router.db_for_write(User), 'accounts')
+        self.assertEqual(router.db_for_write(Token), 'accounts')
+        self.assertEqual(router.db_for_write(Session), 'sessions')
+        self.assertEqual(router.db_for_write(List), 'default')
+        self.assertEqual(router.db_for_read(Item), 'default')
+
+    def test_apps_only_migrate_on_their_database(self):
+        self.assertTrue(router.allow_migrate('accounts', 'accounts'))
+        self.assertFalse(router.allow_migrate('default', 'accounts'))
+        self.assertTrue(router.allow_migrate('sessions', 'sessions'))
+        self.assertFalse(router.allow_migrate('sessions', 'lists'))
+        self.assertTrue(router.allow_migrate('default', 'lists'))
+
+
+class TestRunnerTest(TestCase):
+    def test_tests_never_touch_the_sites_file_cache(self):
+        self.assertNotIsInstance(caches['default'], FileBasedCache)
+
+
+class TakeTokensTest(TestCase):
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+
+    def test_allows_up_to_capacity_then_refills(self):
+        for _ in range(3):
+            self.assertEqual(_take_tokens(self.cache, ['k'], 3, 1, now=100), 0)
+        self.assertAlmostEqual(_take_tokens(self.cache, ['k'], 3, 1, now=100), 1)
+        self.assertAlmostEqual(_take_tokens(self.cache, ['k'], 3, 1, now=100.5), 0.5)
+        self.assertEqual(_take_tokens(self.cache, ['k'], 3, 1, now=101), 0)
+
+    def test_rejection_by_one_bucket_spends_no_tokens(self):
+        _take_tokens(self.cache, ['a'], 1, 1, now=100)
+        self.assertGreater(_take_tokens(self.cache, ['b', 'a'], 1, 1, now=100), 0)
+        self.assertEqual(_take_tokens(self.cache, ['b'], 1, 1, now=100), 0)
+
+
+class CompressedManifestStaticFilesStorageTest(TestCase):
+    def test_collectstatic_writes_hashed_and_gzipped_copies(self):
+        with tempfile.TemporaryDirectory() as static_root, override_settings(STATIC_ROOT=static_root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            manifest = json.load(open(os.path.join(static_root, 'staticfiles.json')))
+            hashed_css = manifest['paths']['base.css']
+            self.assertRegex(hashed_css, r'^base\.[0-9a-f]{12}\.css$')
+            gzipped = os.path.join(static_root, manifest['paths']['bootstrap/css/bootstrap.min.css']) + '.gz'
+            with gzip.open(gzipped) as f:
+                self.assertIn(b'Bootstrap', f.read(200))
+
+    def test_unhashed_urls_without_a_manifest(self):
+        storage = CompressedManifestStaticFilesStorage(location=tempfile.gettempdir())
+        self.assertEqual(storage.url('base.css'), '/static/base.css')
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        metrics_settings = override_settings(
+            METRICS_DB=os.path.join(directory.name, 'metrics.sqlite3'), METRICS_FLUSH_INTERVAL=0
+        )
+        metrics_settings.enable()
+        self.addCleanup(metrics_settings.disable)
+        patcher = mock.patch('superlists.metrics.registry', Registry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_requests_latency_and_queries_per_view(self):
+        list_ = List.objects.create()
+        Item.objects.create(list=list_, text='itemey')
+        self.client.get('/')
+        self.client.get('/')
+        self.client.get(f'/lists/{list_.id}/')
+        metrics = self.client.get('/metrics').content.decode()
+
+        self.assertIn('superlists_requests_total{method="GET",status="200",view="home"} 2\n', metrics)
+        self.assertIn('superlists_request_duration_seconds_count{view="home"} 2\n', metrics)
+        self.assertIn('superlists_request_duration_seconds_bucket{le="+Inf",view="home"} 2\n', metrics)
+        self.assertIn('superlists_request_queries_bucket{le="0.0",view="home"} 2\n', metrics)
+        self.assertRegex(metrics, r'superlists_request_queries_sum\{view="view_list"\} [1-9]')
+        self.assertIn('# TYPE superlists_request_duration_seconds histogram\n', metrics)
+
+    def test_counts_list_table_cache_hits_and_misses(self):
+        list_ = List.objects.create()
+        for _ in range(3):
+            self.client.get(f'/lists/{list_.id}/')
+        metrics = self.client.get('/metrics').content.decode()
+
+        self.assertIn('superlists_cache_requests_total{cache="list_table",result="hit"} 2\n', metrics)
+        self.assertIn('superlists_cache_requests_total{cache="list_table",result="miss"} 1\n', metrics)
+
+    def test_unwritable_metrics_file_does_not_fail_requests(self):
+        with override_settings(METRICS_DB='/nonexistent/metrics.sqlite3'), self.assertLogs('superlists.metrics'):
+            response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        # The observation is kept for the next flush that works.
+        metrics = self.client.get('/metrics').content.decode()
+        self.assertIn('superlists_requests_total{method="GET",status="200",view="home"} 1\n', metrics)
+
+    def test_sums_the_observations_of_every_worker(self):
+        for worker in (Registry(), Registry()):
+            worker.observe_request('home', 'GET', 200, 0.02, 1, 0.001)
+            worker.flush(force=True)
+        metrics = self.client.get('/metrics').content.decode()
+
+        self.assertIn('superlists_request_duration_seconds_bucket{le="0.01",view="home"} 0\n', metrics)
+        self.assertIn('superlists_request_duration_seconds_bucket{le="0.025",view="home"} 2\n', metrics)
+        self.assertIn('superlists_request_queries_sum{view="home"} 2\n', metrics)
+
+
+class WarmUpTest(TestCase):
+    multi_db = True
+
+    def test_renders_home_and_latest_list(self):
+        List.objects.create()
+        latest = List.objects.create()
+        Item.objects.create(list=latest, text='itemey')
+        self.assertEqual(warm_up(), {'/': 200, latest.get_absolute_url(): 200})
+
+    def test_without_lists(self):
+        self.assertEqual(warm_up(), {'/': 200})
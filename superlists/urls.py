@@ -19,11 +19,15 @@ from django.urls import include
 
 from lists import views as lists_views
 from lists import urls as lists_urls
+from lists import api_urls as lists_api_urls
 from accounts import urls as accounts_urls
+from superlists import metrics
 
 urlpatterns = [
     # url(r'^admin/', admin.site.urls),
     url(r'^$', lists_views.home_page, name='home'),
+    url(r'^api/lists/', include(lists_api_urls)),
     url(r'lists/', include(lists_urls)),
     url(r'accounts/', include(accounts_urls)),
+    url(r'^metrics$', metrics.metrics, name='metrics'),
 ]
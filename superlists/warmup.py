@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.test import Client
+
+from lists.models import List
+
+
+def warm_up():
+    """Request the key pages once, in-process, and return their status codes.
+
+    gunicorn calls this in a new master before it forks any worker, so the
+    workers start with the URL resolver, the compiled templates and the list
+    table cache already filled, and a release that can't render them never
+    takes traffic.
+    """
+    client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost')
+    urls = ['/']
+    latest_list = List.objects.order_by('-id').first()
+    if latest_list is not None:
+        urls.append(latest_list.get_absolute_url())
+    return {url: client.get(url).status_code for url in urls}